@@ -1,5 +1,5 @@
 # coding: utf-8
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 from .db_table import DbTable
 
@@ -22,8 +22,53 @@ class DB:
         s += '\n'.join((table.graph() for table in self._tables.values()))
         return s
 
-    def add_relation(self, pk_table_key, fk_table_key, pk_column_key, fk_column_key):
-        """Add a relation between two columns
+    def tables_in_relation_order(self) -> List[DbTable]:
+        """Sort tables so that each table comes after every table referenced by its foreign keys.
+
+        :return: tables in relation order
+        :rtype: List[DbTable]
+        """
+        tables = dict(self._tables)
+
+        tables_ordered = []
+        table_ordered_key = []
+
+        while 1:
+
+            key_to_remove = []
+            for k, table in tables.items():
+
+                # current table can be inserted next only if tables with foreign key in current table are already
+                # inserted
+                to_insert = True
+                for fk_table_key in table.foreign_tables_key():
+                    if fk_table_key not in table_ordered_key:
+                        to_insert = not to_insert
+                        break
+
+                if not to_insert:
+                    continue
+
+                # adding table as next table to insert
+                tables_ordered.append(table)
+
+                # next iterations and loops we will be able to insert table with a relation implying current table
+                # primary key
+                table_ordered_key.append(k)
+
+                key_to_remove.append(k)
+
+            # removing already inserted tables
+            for k in key_to_remove:
+                del tables[k]
+
+            if len(tables) <= 0:
+                break
+
+        return tables_ordered
+
+    def add_relation(self, pk_table_key, fk_table_key, pk_column_key, fk_column_key, relation_key=None):
+        """Add a relation between two columns, relations with the same key are one multi-column foreign key
 
         :param pk_table_key:
         :type pk_table_key:
@@ -33,6 +78,8 @@ class DB:
         :type pk_column_key:
         :param fk_column_key:
         :type fk_column_key:
+        :param relation_key: relation key, default fk_column_key
+        :type relation_key: str
         """
         pk_table = self._tables[pk_table_key]
         pk_column = pk_table.columns[pk_column_key]
@@ -40,4 +87,4 @@ class DB:
         fk_table = self._tables[fk_table_key]
         fk_column = fk_table.columns[fk_column_key]
 
-        fk_column.add_fk(pk_table, pk_column)
+        fk_column.add_fk(pk_table, pk_column, relation_key)
@@ -1,7 +1,7 @@
 # coding: utf-8
-from typing import Dict, Tuple
+from typing import Dict, List, Optional, Tuple
 
-from .table_column import TableColumn
+from .table_column import ColumnType, TableColumn
 
 
 class DbTable:
@@ -9,11 +9,13 @@ class DbTable:
     Table from a database.
     """
 
-    def __init__(self, key, name="", columns=None):
+    def __init__(self, key, name="", columns=None, without_rowid=False, strict=False):
 
         self._key: str = key
         self._name: str = name
         self._columns: Dict[str, TableColumn] = {} if columns is None else columns
+        self._without_rowid: bool = without_rowid
+        self._strict: bool = strict
 
     @property
     def columns(self):
@@ -27,6 +29,24 @@ class DbTable:
     def key(self):
         return self._key
 
+    @property
+    def without_rowid(self):
+        """table is stored in its primary key b-tree, without rowid"""
+        return self._without_rowid
+
+    @without_rowid.setter
+    def without_rowid(self, value):
+        self._without_rowid = value
+
+    @property
+    def strict(self):
+        """table columns type is enforced"""
+        return self._strict
+
+    @strict.setter
+    def strict(self, value):
+        self._strict = value
+
     def graph(self, lvl=4):
         """display object with it's information and it's column."""
         s = f"{' '*lvl}-{self._name}({self.key=})\n"
@@ -41,6 +61,44 @@ class DbTable:
         iterator = filter(lambda col: col.fk, self._columns.values())
         return (col.fk_table.key for col in iterator)
 
-    def primary_key(self):
+    def foreign_keys(self) -> List[Tuple[Tuple[TableColumn, ...], "DbTable", Tuple[TableColumn, ...]]]:
+        """
+        :return: foreign keys of this table as (columns, referenced table, referenced columns), columns of a
+            multi-column foreign key are in table order
+        :rtype: List[Tuple[Tuple[TableColumn, ...], DbTable, Tuple[TableColumn, ...]]]
+        """
+        fk_columns: Dict[str, List[TableColumn]] = {}
+        for col in self._columns.values():
+            if col.fk:
+                fk_columns.setdefault(col.fk_key, []).append(col)
+
+        return [(tuple(columns), columns[0].fk_table, tuple(col.fk_column for col in columns))
+                for columns in fk_columns.values()]
+
+    def primary_keys(self) -> Tuple[TableColumn, ...]:
+        """
+        :return: primary key columns, in primary key order
+        :rtype: Tuple[TableColumn, ...]
+        """
         t = tuple(filter(lambda col: col.pk, self._columns.values()))
-        return t[0] if len(t)>0 else None
+        # columns without sequence keep their order, after columns with a sequence
+        return tuple(sorted(t, key=lambda col: (col.pk_seq is None, col.pk_seq or 0)))
+
+    def primary_key(self) -> Optional[TableColumn]:
+        """
+        :return: primary key column, None if there is no primary key or if it is composite
+        :rtype: TableColumn
+        """
+        t = self.primary_keys()
+        return t[0] if len(t) == 1 else None
+
+    def generated_primary_key(self) -> Optional[TableColumn]:
+        """
+        :return: primary key column generated by sqlite when inserted as NULL, only for a one column INTEGER primary
+            key in a rowid table, alias of rowid
+        :rtype: TableColumn
+        """
+        pk = self.primary_key()
+        if self._without_rowid or pk is None or pk.sqlite_type != ColumnType.INTEGER:
+            return None
+        return pk
@@ -21,17 +21,19 @@ class TableColumn:
     Column from a database table
     """
 
-    def __init__(self, key, name, autoincrement, pk, column_type, not_null):
+    def __init__(self, key, name, autoincrement, pk, column_type, not_null, pk_seq=None):
 
         self._key: str = key
         self._name: str = name
         self._autoincrement: bool = autoincrement
         self._pk: bool = pk
+        self._pk_seq: Optional[int] = pk_seq
         self._type: int = column_type
         self._not_null: bool = not_null
         self._fk: bool = False
         self._fk_table = None
         self._fk_column: Optional[TableColumn] = None
+        self._fk_key: Optional[str] = None
 
     @property
     def key(self):
@@ -49,6 +51,15 @@ class TableColumn:
     def pk(self):
         return self._pk
 
+    @property
+    def pk_seq(self):
+        """position of this column in table primary key, None if unknown"""
+        return self._pk_seq
+
+    @property
+    def autoincrement(self):
+        return self._autoincrement
+
     @property
     def fk_table(self):
         return self._fk_table
@@ -65,22 +76,42 @@ class TableColumn:
     def not_null(self):
         return self._not_null
 
+    @property
+    def sqlite_type(self) -> ColumnType:
+        """sqlite type of this column, from its PowerArchitect type"""
+        type_assoc_map = {
+            4: ColumnType.INTEGER,
+            -2: ColumnType.BLOB,
+            12: ColumnType.TEXT,
+            1: ColumnType.TEXT,
+        }
+        return type_assoc_map.get(self._type, ColumnType.INTEGER)
+
     @property
     def fk_column(self):
         return self._fk_column
 
-    def add_fk(self, table, column):
+    @property
+    def fk_key(self):
+        """key of the foreign key containing this column, shared by columns of a multi-column foreign key"""
+        return self._fk_key
+
+    def add_fk(self, table, column, fk_key=None):
         """Set this column as a foreign key from another table.
 
         :param table: other table
         :type table: DbTable
         :param column: primary in other table
         :type column: TableColumn
+        :param fk_key: key of the foreign key, columns with the same key are one multi-column foreign key. Default
+            column key, a one column foreign key
+        :type fk_key: str
         """
 
         self._fk = True
         self._fk_table = table
         self._fk_column = column
+        self._fk_key = self._key if fk_key is None else fk_key
 
     def graph(self, lvl=8):
         """display object as a one liner with it's information"""
@@ -0,0 +1,224 @@
+# coding: utf-8
+import json
+import random
+import sqlite3
+import sys
+from argparse import ArgumentParser
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from architect import DB, DbTable, TableColumn
+from data_io import load_from_architect_file
+from builder import SQLiteScriptBuilder
+from builder.sqlite_script_builder import ColumnType
+from main import set_storage_options
+
+# query plan details revealing a slow access path
+SLOW_PLAN_PATTERNS = {
+    "SCAN ": "full scan",
+    "USE TEMP B-TREE": "temporary b-tree",
+}
+
+
+def create_database(db: DB, rows: int = 0) -> sqlite3.Connection:
+    """Create the sqlite script schema in an in-memory database.
+
+    :param db: Database object
+    :type db: DB
+    :param rows: number of synthetic rows inserted in each table before ANALYZE, no rows and no statistics if 0
+    :type rows: int
+    :return: connection to the database
+    :rtype: sqlite3.Connection
+    """
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(SQLiteScriptBuilder.dump(db))
+
+    if rows > 0:
+        rand = random.Random(0)
+        for table in db.tables_in_relation_order():
+            columns = list(table.columns.values())
+            req = f"INSERT INTO {table.name} ({', '.join(col.name for col in columns)}) " \
+                  f"VALUES ({', '.join('?' * len(columns))});"
+            conn.executemany(req, (synthetic_row(table, columns, i, rows, rand) for i in range(1, rows + 1)))
+        conn.commit()
+        conn.execute("ANALYZE;")
+
+    return conn
+
+
+def synthetic_row(table: DbTable, columns: Sequence[TableColumn], i: int, rows: int, rand: random.Random) -> List:
+    """Values of columns for the i-th synthetic row: unique, or a random existing parent row for a foreign key.
+
+    Parent tables get the same number of rows, so i is an existing parent row for a foreign key in a primary key.
+    Every column of the j-th row holds j, so all columns of a foreign key take the same parent row.
+    """
+    parent_rows = {}
+    for fk_columns, _, _ in table.foreign_keys():
+        j = i if any(col.pk for col in fk_columns) else rand.randint(1, rows)
+        parent_rows.update((col.key, j) for col in fk_columns)
+    return [synthetic_value(col, parent_rows.get(col.key, i)) for col in columns]
+
+
+def synthetic_value(column: TableColumn, i: int):
+    """Value of a column holding i, in column type."""
+    column_type = SQLiteScriptBuilder.column_type(column)
+    if column_type == ColumnType.TEXT:
+        return str(i)
+    if column_type == ColumnType.BLOB:
+        return i.to_bytes(8, "little")
+    if column_type == ColumnType.REAL:
+        return float(i)
+    return i
+
+
+def access_paths(db: DB) -> Iterator[Tuple[DbTable, str, str]]:
+    """Canonical queries implied by the model: primary key lookups, foreign key joins in both directions, and the
+    child lookup run by foreign key enforcement when a parent row is deleted.
+
+    :param db: Database object
+    :type db: DB
+    :return: (table, access path name, query)
+    :rtype: Iterator[Tuple[DbTable, str, str]]
+    """
+    for table in db.tables_in_relation_order():
+        pks = table.primary_keys()
+        if pks:
+            where = " AND ".join(f"{col.name} = ?" for col in pks)
+            yield table, "pk_lookup", f"SELECT * FROM {table.name} WHERE {where};"
+
+        child_where = " AND ".join(f"{table.name}.{col.name} = ?" for col in pks) if pks else \
+            f"{table.name}.rowid = ?"
+
+        for columns, parent, parent_columns in table.foreign_keys():
+            pairs = list(zip(columns, parent_columns))
+            on = " AND ".join(f"{table.name}.{col.name} = {parent.name}.{parent_col.name}" for col, parent_col in pairs)
+            parent_where = " AND ".join(f"{parent.name}.{parent_col.name} = ?" for _, parent_col in pairs)
+            child_fk_where = " AND ".join(f"{col.name} = ?" for col in columns)
+
+            yield table, "fk_child_to_parent", \
+                f"SELECT * FROM {table.name} JOIN {parent.name} ON {on} WHERE {child_where};"
+            yield table, "fk_parent_to_children", \
+                f"SELECT * FROM {parent.name} JOIN {table.name} ON {on} WHERE {parent_where};"
+            # sqlite runs this lookup for each deleted parent row when foreign keys are enforced
+            yield table, "fk_parent_delete", f"SELECT 1 FROM {table.name} WHERE {child_fk_where};"
+
+
+def audit(db: DB, rows: int = 0, baseline: Optional[Set[Tuple[str, str, str]]] = None) -> Dict:
+    """Run EXPLAIN QUERY PLAN over access paths and flag full scans and temporary b-trees.
+
+    :param db: Database object
+    :type db: DB
+    :param rows: number of synthetic rows by table, see create_database
+    :type rows: int
+    :param baseline: accepted (table, access path, finding), see load_baseline
+    :type baseline: Set[Tuple[str, str, str]]
+    :return: report with one check by access path, the total number of findings and of findings not in baseline
+    :rtype: Dict
+    """
+    baseline = set() if baseline is None else baseline
+    conn = create_database(db, rows)
+
+    checks = []
+    for table, path, query in access_paths(db):
+        parameters = (None,) * query.count("?")
+        plan = [detail for _, _, _, detail in conn.execute(f"EXPLAIN QUERY PLAN {query}", parameters)]
+        findings = [f"{name}: {detail}" for detail in plan
+                    for pattern, name in SLOW_PLAN_PATTERNS.items() if detail.startswith(pattern)]
+        new_findings = [finding for finding in findings if (table.name, path, finding) not in baseline]
+        checks.append({"table": table.name, "access_path": path, "query": query, "plan": plan,
+                       "findings": findings, "new_findings": new_findings})
+    conn.close()
+
+    return {"rows": rows, "checks": checks, "findings": sum(len(check["findings"]) for check in checks),
+            "new_findings": sum(len(check["new_findings"]) for check in checks)}
+
+
+def load_baseline(filepath: str) -> Set[Tuple[str, str, str]]:
+    """Read accepted findings from a baseline file written by dump_baseline.
+
+    :param filepath: json baseline file path
+    :type filepath: str
+    :return: accepted (table, access path, finding)
+    :rtype: Set[Tuple[str, str, str]]
+    :raise ValueError: file is not a baseline
+    """
+    with open(filepath) as fp:
+        entries = json.load(fp)
+    try:
+        return {(entry["table"], entry["access_path"], entry["finding"]) for entry in entries}
+    except (KeyError, TypeError) as error:
+        raise ValueError(f"{filepath} is not an audit baseline: {error!r}") from error
+
+
+def dump_baseline(report: Dict, filepath: str):
+    """Write every finding of a report in a baseline file, to accept them in next audits.
+
+    :param report: audit report
+    :type report: Dict
+    :param filepath: json baseline file path
+    :type filepath: str
+    """
+    entries = [{"table": check["table"], "access_path": check["access_path"], "finding": finding}
+               for check in report["checks"] for finding in check["findings"]]
+    with open(filepath, "w") as fp:
+        json.dump(entries, fp, indent=2)
+
+
+def launch(script, rows=0, output=None, without_rowid=None, strict=None, baseline=None, update_baseline=False) -> int:
+
+    db = load_from_architect_file(script)
+    set_storage_options(db, without_rowid, strict)
+    report = audit(db, rows, None if baseline is None or update_baseline else load_baseline(baseline))
+    if update_baseline:
+        dump_baseline(report, baseline)
+        report["new_findings"] = 0
+
+    report_str = json.dumps(report, indent=2)
+    if output is None:
+        print(report_str)
+    else:
+        with open(output, "w") as fp:
+            fp.write(report_str)
+
+    # non zero exit code to fail a CI job
+    return 1 if report["new_findings"] else 0
+
+
+def cmd_line_interface():
+    """
+    command line interface function.
+    """
+    parser = ArgumentParser(description="audit query plans of the sqlite script access paths, exit code is 1 if a "
+                                        "full scan or a temporary b-tree is found and not in the baseline")
+
+    parser.add_argument("script", help="architect script path(*.xml)", type=str)
+
+    parser.add_argument("-r", "--rows", help="synthetic rows by table before ANALYZE, default:0 (no statistics)",
+                        default=0, type=int)
+
+    parser.add_argument("-o", "--output", help="json report file path, default:stdout", default=None, type=str)
+
+    parser.add_argument("--without-rowid", help="create tables WITHOUT ROWID, every table allowing it and without "
+                                                 "a rowid alias primary key if no table is given", nargs="*", default=None, metavar="TABLE")
+
+    parser.add_argument("--strict", help="create STRICT tables, every table if no table is given",
+                        nargs="*", default=None, metavar="TABLE")
+
+    parser.add_argument("-b", "--baseline", help="json file of accepted findings, only other findings fail",
+                        default=None, type=str)
+
+    parser.add_argument("--update-baseline", help="write every finding in the baseline file instead of failing",
+                        action="store_true")
+
+    args = parser.parse_args()
+    if args.update_baseline and args.baseline is None:
+        parser.error("--update-baseline needs --baseline")
+
+    try:
+        code = launch(**args.__dict__)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    cmd_line_interface()
@@ -0,0 +1,212 @@
+# coding: utf-8
+import json
+import random
+import sqlite3
+import tempfile
+import time
+from argparse import ArgumentParser
+from typing import Dict, Optional
+
+from architect import DB
+from data_io import load_from_architect_file
+from audit import create_database, synthetic_row, synthetic_value
+from main import load_connector, set_storage_options
+
+
+def database_size(conn: sqlite3.Connection) -> Dict[str, int]:
+    """Size in bytes of the database, and of each table and index when sqlite is compiled with dbstat.
+
+    :param conn: connection to the database
+    :type conn: sqlite3.Connection
+    :return: size by table or index name, total size under "total"
+    :rtype: Dict[str, int]
+    """
+    page_size = conn.execute("PRAGMA page_size;").fetchone()[0]
+    page_count = conn.execute("PRAGMA page_count;").fetchone()[0]
+    sizes = {"total": page_size * page_count}
+    try:
+        sizes.update(conn.execute("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name ORDER BY name;"))
+    except sqlite3.OperationalError:
+        # no dbstat virtual table in this sqlite
+        pass
+    return sizes
+
+
+def pk_lookups(db: DB, conn: sqlite3.Connection, rows: int, lookups: int) -> Dict[str, float]:
+    """Mean duration of a primary key lookup of a random synthetic row, in each table with a primary key.
+
+    :param db: Database object
+    :type db: DB
+    :param conn: connection to the database filled by create_database
+    :type conn: sqlite3.Connection
+    :param rows: number of synthetic rows by table
+    :type rows: int
+    :param lookups: number of lookups by table
+    :type lookups: int
+    :return: microseconds by lookup for each table
+    :rtype: Dict[str, float]
+    """
+    rand = random.Random(0)
+    timings = {}
+    for table in db.tables_in_relation_order():
+        pks = table.primary_keys()
+        if not pks:
+            continue
+
+        where = " AND ".join(f"{col.name} = ?" for col in pks)
+        req = f"SELECT * FROM {table.name} WHERE {where};"
+        # primary key columns of the i-th synthetic row all hold i, see synthetic_value
+        keys = [[synthetic_value(col, i) for col in pks]
+                for i in (rand.randint(1, rows) for _ in range(lookups))]
+
+        start = time.perf_counter()
+        for key in keys:
+            conn.execute(req, key).fetchone()
+        timings[table.name] = (time.perf_counter() - start) / lookups * 1e6
+
+    return timings
+
+
+def storage_benchmark(script: str, rows: int = 10000, lookups: int = 10000) -> Dict:
+    """Compare database size and primary key lookup time of the schema with and without WITHOUT ROWID tables.
+
+    Tables are filled with synthetic rows, see audit.create_database. Every table allowing it, except the ones with
+    a rowid alias primary key, is created WITHOUT ROWID in the second layout, composite primary keys included.
+
+    :param script: architect script path
+    :type script: str
+    :param rows: number of synthetic rows by table
+    :type rows: int
+    :param lookups: number of primary key lookups by table
+    :type lookups: int
+    :return: report with sizes in bytes and lookup times in microseconds of each layout
+    :rtype: Dict
+    """
+    report = {"rows": rows, "lookups": lookups, "layouts": {}}
+    for layout, without_rowid in (("rowid", None), ("without_rowid", [])):
+        db = load_from_architect_file(script)
+        set_storage_options(db, without_rowid)
+        conn = create_database(db, rows)
+        report["layouts"][layout] = {
+            "without_rowid_tables": [table.name for table in db.tables.values() if table.without_rowid],
+            "composite_pk_tables": [table.name for table in db.tables.values() if len(table.primary_keys()) > 1],
+            "size": database_size(conn),
+            "pk_lookup_us": pk_lookups(db, conn, rows, lookups),
+        }
+        conn.close()
+
+    return report
+
+
+def columns_benchmark(script: str, table: Optional[str] = None, rows: int = 100000, repeat: int = 3) -> Dict:
+    """Compare row and column inputs of executemany: _dump_rows_* with rows, dump_columns with columns, and
+    _dump_rows_* with rows zipped from columns first.
+
+    Synthetic values are inserted in an in-memory database, with foreign keys enforcement off since referenced
+    tables are empty. Durations are the best of repeat runs, commit included.
+
+    :param script: architect script path
+    :type script: str
+    :param table: table name, default first table in relation order
+    :type table: str
+    :param rows: number of rows inserted by run
+    :type rows: int
+    :param repeat: number of runs by input
+    :type repeat: int
+    :return: report with seconds and rows by second of each input
+    :rtype: Dict
+    """
+    db = load_from_architect_file(script)
+    tables = {t.name: t for t in db.tables_in_relation_order()}
+    db_table = tables[next(iter(tables)) if table is None else table]
+    fcn_name = db_table.name.lower()
+
+    with tempfile.TemporaryDirectory() as directory:
+        module = load_connector(db, directory)
+
+    # a generated primary key is left to sqlite
+    rand = random.Random(0)
+    table_columns = {col.name: col for col in db_table.columns.values()}
+    pk = module.TABLES_ROWID_ALIAS.get(db_table.name)
+    names = [name for name in module.TABLES_COLUMNS[db_table.name] if name != pk]
+    values = zip(*(synthetic_row(db_table, [table_columns[name] for name in names], i, rows, rand)
+                   for i in range(1, rows + 1)))
+    columns = dict(zip(names, map(list, values)))
+    row_values = [columns[name] if name in columns else [None] * rows
+                  for name in module.TABLES_COLUMNS[db_table.name]]
+    table_rows = list(zip(*row_values))
+
+    inputs = {
+        "rows": lambda connector: getattr(connector, f"_dump_rows_{fcn_name}")(table_rows),
+        "columns": lambda connector: getattr(connector, f"_dump_columns_{fcn_name}")(columns),
+        "rows_zipped_from_columns": lambda connector: getattr(connector, f"_dump_rows_{fcn_name}")(
+            list(zip(*row_values))),
+    }
+
+    seconds = {}
+    for name, dump in inputs.items():
+        timings = []
+        for _ in range(repeat):
+            connector = module.ArchitectSQliteConnector(":memory:", True)
+            connector.conn.execute("PRAGMA foreign_keys = OFF;")
+            start = time.perf_counter()
+            dump(connector)
+            connector.conn.commit()
+            timings.append(time.perf_counter() - start)
+            connector.close()
+        seconds[name] = min(timings)
+
+    return {"table": db_table.name, "rows": rows, "repeat": repeat, "seconds": seconds,
+            "rows_per_second": {name: rows / value for name, value in seconds.items()}}
+
+
+BENCHMARKS = {
+    "storage": storage_benchmark,
+    "columns": columns_benchmark,
+}
+
+
+def launch(benchmark, output=None, **kwargs):
+
+    report = BENCHMARKS[benchmark](**kwargs)
+
+    report_str = json.dumps(report, indent=2)
+    if output is None:
+        print(report_str)
+    else:
+        with open(output, "w") as fp:
+            fp.write(report_str)
+
+
+def cmd_line_interface():
+    """
+    command line interface function.
+    """
+    parser = ArgumentParser(description="benchmarks of the sqlite script and python functions built from an "
+                                        "architect script, json report")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    storage = subparsers.add_parser("storage", help="database size and primary key lookup time, with and without "
+                                                    "WITHOUT ROWID tables")
+    storage.add_argument("-r", "--rows", help="synthetic rows by table, default:10000", default=10000, type=int)
+    storage.add_argument("-l", "--lookups", help="primary key lookups by table, default:10000", default=10000,
+                         type=int)
+
+    columns = subparsers.add_parser("columns", help="executemany with rows or with columns, see dump_columns")
+    columns.add_argument("-t", "--table", help="table name, default:first table in relation order", default=None,
+                         type=str)
+    columns.add_argument("-r", "--rows", help="rows inserted by run, default:100000", default=100000, type=int)
+    columns.add_argument("-n", "--repeat", help="runs by input, best one is kept, default:3", default=3, type=int)
+
+    for subparser in subparsers.choices.values():
+        subparser.add_argument("script", help="architect script path(*.xml)", type=str)
+        subparser.add_argument("-o", "--output", help="json report file path, default:stdout", default=None,
+                               type=str)
+
+    args = parser.parse_args()
+
+    launch(**args.__dict__)
+
+
+if __name__ == "__main__":
+    cmd_line_interface()
@@ -1,5 +1,9 @@
 # coding: utf-8
+import re
+from typing import Dict, List, Optional, Tuple
+
 from .abstract_builder import AbstractBuilder
+from .sqlite_script_builder import SQLiteScriptBuilder, ColumnType
 from architect import DB, DbTable
 
 
@@ -8,31 +12,174 @@ class PythonScriptBuilder(AbstractBuilder):
     COMMENT = "#"
 
     @classmethod
-    def dump(cls, db: DB) -> str:
+    def dump(cls, db: DB, shard_by: Optional[str] = None) -> str:
         """Create python functions to dump one or more row in each database's table.
 
         :param db: Database object
         :type db: DB
+        :param shard_by: "table.column" used to spread rows over several files, no sharded connector if None
+        :type shard_by: str
         :return: functions for each table
         :rtype: str
         """
-        return f"{cls.generate_header()}\n{cls._dump_db(db)}"
+        return f"{cls.generate_header()}\n{cls._dump_db(db, shard_by)}"
+
+    @classmethod
+    def dump_package(cls, db: DB, shard_by: Optional[str] = None) -> Dict[str, str]:
+        """Create a python package: connector module, and one module by table with table functions.
+
+        Table modules are imported on first access to one of their functions, so that a process using a few tables
+        only imports these tables.
+
+        :param db: Database object
+        :type db: DB
+        :param shard_by: "table.column" used to spread rows over several files, no sharded connector if None
+        :type shard_by: str
+        :return: script of each module by file name
+        :rtype: Dict[str, str]
+        """
+        header = cls.generate_header()
+        shard_columns, parent_key_tables = (None, ()) if shard_by is None else cls._shard_columns(db, shard_by)
+
+        modules = {}
+        lazy_methods = {}
+        for table in db.tables.values():
+            module_name = f"table_{table.name.lower()}"
+            methods_str = cls._dump_table(table)
+            classes_str = f"class ConnectorMethods:\n{methods_str}\n"
+            if shard_columns is not None:
+                sharded_methods_str = cls._dump_sharded_table(table, table.name in shard_columns)
+                classes_str += f"\n\nclass ShardedConnectorMethods:\n{sharded_methods_str}\n"
+
+            for method_name in re.findall(r"^    def (\w+)\(", methods_str, re.MULTILINE):
+                lazy_methods[method_name] = module_name
+            modules[f"{module_name}.py"] = f"""{header}
+# coding: utf-8
+from .connector import *
+
+
+# functions of table {table.name}, added to connector classes on first access
+{classes_str}"""
+
+        lazy_lines = (f'    "{method_name}": "{module_name}",' for method_name, module_name in lazy_methods.items())
+        lazy_str = "\n".join(lazy_lines)
+
+        sharded_str = ""
+        lazy_sharded_str = ""
+        if shard_columns is not None:
+            sharded_str = f"\n\n{cls._dump_sharded_connector(shard_columns, parent_key_tables)}"
+            lazy_sharded_str = '''
+ShardedArchitectSQliteConnector.__getattr__ = lazy_table_methods("ShardedConnectorMethods")'''
+
+        modules["connector.py"] = f'''{header}
+{cls._dump_connector(package=True)}{sharded_str}
+
+{cls._dump_tables_metadata(db)}
+# module of each table function
+LAZY_METHODS = {{
+{lazy_str}
+}}
+
+
+def lazy_table_methods(namespace: str):
+    """Create a __getattr__ function adding table functions to a connector class on first access.
+
+    :param namespace: name of the class holding the functions in table modules
+    :type namespace: str
+    """
+    def __getattr__(self, name):
+        module_name = LAZY_METHODS.get(name)
+        if module_name is None:
+            raise AttributeError(f"'{{type(self).__name__}}' object has no attribute '{{name}}'")
+
+        module = importlib.import_module(f".{{module_name}}", __package__)
+        methods = vars(getattr(module, namespace))
+        for method_name, method in methods.items():
+            if not method_name.startswith("__"):
+                setattr(type(self), method_name, method)
+
+        # LAZY_METHODS lists connector functions, a sharded connector only has some of them
+        if name not in methods:
+            raise AttributeError(f"'{{type(self).__name__}}' object has no attribute '{{name}}'")
+        return getattr(self, name)
+
+    return __getattr__
+
+
+ArchitectSQliteConnector.__getattr__ = lazy_table_methods("ConnectorMethods"){lazy_sharded_str}
+'''
+
+        modules["__init__.py"] = f'''{header}
+# coding: utf-8
+import importlib
+
+from .connector import *
+
+
+def __getattr__(name):
+    """Import table modules on first access"""
+    if name in LAZY_METHODS.values():
+        return importlib.import_module(f".{{name}}", __name__)
+    raise AttributeError(f"module {{__name__!r}} has no attribute {{name!r}}")
+'''
+        return modules
 
     @classmethod
-    def _dump_db(cls, db: DB) -> str:
+    def _dump_db(cls, db: DB, shard_by: Optional[str] = None) -> str:
         """Create python functions to dump one or more row in each database's table.
 
         :param db: Database object
         :type db: DB
+        :param shard_by: "table.column" used to spread rows over several files, no sharded connector if None
+        :type shard_by: str
         :return: functions for each table
         :rtype: str
         """
 
+        tables_to_dump = []
+        for table in db.tables.values():
+            tables_to_dump.append(cls._dump_table(table))
+        tables_str = "\n".join(tables_to_dump)
+
+        sharded_str = ""
+        if shard_by is not None:
+            shard_columns, parent_key_tables = cls._shard_columns(db, shard_by)
+            sharded_tables_str = "\n".join(cls._dump_sharded_table(table, table.name in shard_columns)
+                                            for table in db.tables.values())
+            sharded_str = f"\n\n{cls._dump_sharded_connector(shard_columns, parent_key_tables)}{sharded_tables_str}"
+
+        return f'{cls._dump_connector()}{tables_str}{sharded_str}\n\n{cls._dump_tables_metadata(db)}'
+
+    @classmethod
+    def _dump_connector(cls, package: bool = False) -> str:
+        """Create python module header and connector class, without table functions.
+
+        :param package: connector module of a package, importing table modules on first access
+        :type package: bool
+        :return: module header and connector class
+        :rtype: str
+        """
+        importlib_str = "import importlib\n" if package else ""
+
         dump_class = '''# coding: utf-8
 import sqlite3
 import os
 import logging
-from typing import List
+import binascii
+import bisect
+import collections
+import csv
+import heapq
+''' + importlib_str + '''import itertools
+import json
+import queue
+import tempfile
+import threading
+import time
+import zlib
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, TextIO, Union
 
 with open("./ressources/sqlite/sqlite.sql", 'r', encoding="utf-8") as fp:
     SQLITE_CREATION_SCRIPT = fp.read()
@@ -40,6 +187,12 @@ with open("./ressources/sqlite/sqlite.sql", 'r', encoding="utf-8") as fp:
 
 logger = logging.getLogger(__name__)
 
+# bytes copied at once by incremental BLOB functions
+BLOB_CHUNK_SIZE = 64 * 1024
+
+# csv field size limit of import_csv_directory, csv default 128 KiB is too small for base64 BLOB values
+CSV_FIELD_SIZE_LIMIT = 2 ** 31 - 1
+
 
 def args_logger_decorator(func):
     """Decorate a function to log it's arguments"""
@@ -73,26 +226,1659 @@ class SqLiteRequestBuilder:
                                      question_mark_placeholder=', '.join("?" * number_of_column))
 
 
+class GroupCommitError(sqlite3.Error):
+    """Rows rejected by the group commit writer.
+
+    :ivar failures: (table, row, error) of each rejected row
+    """
+
+    def __init__(self, failures: List[tuple]):
+        self.failures = failures
+        table, _, error = failures[0]
+        super().__init__(f"{len(failures)} rows rejected by group commit, first one in table {table}: {error}")
+
+
+class GroupCommitWriter:
+    """Insert single rows by group from a background thread.
+
+    Rows are buffered in a bounded queue. The writer thread commits them with one executemany per table, in
+    relation order, as soon as *max_rows* rows are pending or *max_delay* seconds after the first pending row. A
+    group meeting a locked database is retried as a whole. When a group fails otherwise, its rows are inserted again
+    one by one so that only rejected rows are lost. Each row has a future telling whether it is committed, rejected
+    rows are also reported by the next flush or close.
+    """
+
+    def __init__(self, filepath: str, max_rows: int = 1000, max_delay: float = 0.05, max_pending: int = 10000,
+                 busy_timeout: float = 5., busy_retries: int = 5, **kwargs):
+        """
+        :param filepath: database file path
+        :type filepath: str
+        :param max_rows: number of pending rows triggering a commit
+        :type max_rows: int
+        :param max_delay: seconds between first pending row and commit
+        :type max_delay: float
+        :param max_pending: queue size, put blocks when queue is full
+        :type max_pending: int
+        :param busy_timeout: seconds a statement waits for a lock held by another connection
+        :type busy_timeout: float
+        :param busy_retries: number of times a group is retried while database is still locked after busy_timeout
+        :type busy_retries: int
+        :param kwargs: sqlite3.connect arguments
+        """
+        kwargs["check_same_thread"] = False
+        self._conn = sqlite3.connect(filepath, **kwargs)
+        self._conn.execute("PRAGMA foreign_keys = ON;")
+        self._conn.execute(f"PRAGMA busy_timeout = {int(busy_timeout * 1000)};")
+        self._busy_retries = busy_retries
+        self._requests = {table: SqLiteRequestBuilder.set_insert_or_x_request(table, columns, "FAIL")
+                          for table, columns in TABLES_COLUMNS.items()}
+        self._tables_order = {table: i for i, table in enumerate(TABLES_COLUMNS)}
+
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._max_rows = max_rows
+        self._max_delay = max_delay
+        # (table, row, future) of rows read from queue and not committed yet
+        self._pending: List[tuple] = []
+        self._failures: List[tuple] = []
+        self._failures_lock = threading.Lock()
+        self._closed = False
+        self._stopped = False
+        self._stop_error: Optional[BaseException] = None
+
+        self._thread = threading.Thread(target=self._run, name="GroupCommitWriter", daemon=True)
+        self._thread.start()
+
+    def put(self, table: str, row: tuple) -> Future:
+        """Queue a row to insert in table, block while the queue is full.
+
+        :param table: table name
+        :type table: str
+        :param row: row values, in the same order as in table
+        :type row: tuple
+        :return: future of the row insertion, its exception is set if the row is rejected
+        :rtype: concurrent.futures.Future
+        :raise RuntimeError: writer is closed or stopped
+        """
+        if self._closed:
+            raise RuntimeError("group commit writer is closed")
+        future = Future()
+        self._put((table, row, future))
+        return future
+
+    def flush(self):
+        """Block until every row queued so far is committed or rejected.
+
+        :raise GroupCommitError: rows were rejected since last flush or close
+        :raise RuntimeError: writer thread stopped on an unexpected error
+        """
+        if not self._closed and not self._stopped:
+            done = threading.Event()
+            self._put((None, None, done))
+            # writer thread sets pending events when it stops, but not the ones queued after it stopped
+            while not done.wait(0.1) and self._thread.is_alive():
+                pass
+        self._raise_failures()
+
+    def close(self):
+        """Commit queued rows, then stop writer thread and close its connection.
+
+        :raise GroupCommitError: rows were rejected since last flush
+        :raise RuntimeError: writer thread stopped on an unexpected error
+        """
+        if not self._closed:
+            self._closed = True
+            if not self._stopped:
+                self._put((None, None, None))
+            self._thread.join()
+        self._raise_failures()
+
+    def _put(self, item: tuple):
+        while not self._stopped:
+            try:
+                self._queue.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+            if self._stopped:
+                # writer thread stopped meanwhile, nobody else reads this item
+                self._reject_queued()
+            return
+        raise RuntimeError("group commit writer stopped") from self._stop_error
+
+    def _raise_failures(self):
+        with self._failures_lock:
+            failures, self._failures = self._failures, []
+        if failures:
+            raise GroupCommitError(failures)
+        if self._stop_error is not None:
+            raise RuntimeError("group commit writer stopped") from self._stop_error
+
+    def _reject(self, table: str, row: tuple, future: Future, error: BaseException):
+        future.set_exception(error)
+        with self._failures_lock:
+            self._failures.append((table, row, error))
+
+    def _reject_queued(self):
+        """Reject rows left in queue and notify flushes once writer thread is stopped."""
+        error = RuntimeError("group commit writer stopped") if self._stop_error is None else self._stop_error
+        while 1:
+            try:
+                table, row, waiter = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if table is not None:
+                self._reject(table, row, waiter, error)
+            elif waiter is not None:
+                waiter.set()
+
+    def _run(self):
+        try:
+            self._write_loop()
+        except BaseException as error:
+            logger.exception("group commit writer stopped")
+            self._stop_error = error
+            for table, row, future in self._pending:
+                if not future.done():
+                    self._reject(table, row, future, error)
+            self._pending = []
+        finally:
+            self._stopped = True
+            self._conn.close()
+            self._reject_queued()
+
+    def _write_loop(self):
+        deadline = None
+
+        while 1:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0.)
+            try:
+                table, row, waiter = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                table, row, waiter = None, None, False
+
+            if table is not None:
+                self._pending.append((table, row, waiter))
+                if deadline is None:
+                    deadline = time.monotonic() + self._max_delay
+                if len(self._pending) < self._max_rows:
+                    continue
+
+            self._commit()
+            deadline = None
+
+            # control message: None to stop, an event to notify a flush, False on timeout
+            if table is None:
+                if waiter is None:
+                    return
+                if waiter:
+                    waiter.set()
+
+    def _commit(self):
+        if not self._pending:
+            return
+
+        rows_by_table = {}
+        for table, row, _ in self._pending:
+            rows_by_table.setdefault(table, []).append(row)
+
+        def commit_group():
+            with self._conn:
+                # insert in relation order so that a row can reference a row from the same group
+                for table in TABLES_COLUMNS:
+                    rows = rows_by_table.get(table)
+                    if rows:
+                        self._conn.executemany(self._requests[table], rows)
+
+        try:
+            self._retry_busy(commit_group)
+        except Exception as error:
+            if self._is_busy(error):
+                # rows are not at fault, inserting them one by one would meet the same lock
+                for table, row, future in self._pending:
+                    self._reject(table, row, future, error)
+                logger.warning(f"group commit rejected {len(self._pending)} rows, database is locked: {error}")
+            else:
+                self._commit_row_by_row()
+        else:
+            for *_, future in self._pending:
+                future.set_result(None)
+        self._pending = []
+
+    def _commit_row_by_row(self):
+        # relation order, then queue order
+        pending = sorted(self._pending, key=lambda entry: self._tables_order[entry[0]])
+
+        def commit_rows():
+            errors = []
+            with self._conn:
+                for table, row, _ in pending:
+                    try:
+                        self._conn.execute(self._requests[table], row)
+                        errors.append(None)
+                    except Exception as error:
+                        if self._is_busy(error):
+                            raise
+                        errors.append(error)
+            return errors
+
+        try:
+            errors = self._retry_busy(commit_rows)
+        except Exception as error:
+            # transaction failed: no row is committed
+            errors = [error] * len(pending)
+
+        for (table, row, future), error in zip(pending, errors):
+            if error is None:
+                future.set_result(None)
+            else:
+                self._reject(table, row, future, error)
+        rejected = [error for error in errors if error is not None]
+        if rejected:
+            logger.warning(f"group commit rejected {len(rejected)} rows of {len(pending)}, first error: {rejected[0]}")
+
+    def _retry_busy(self, transaction: Callable):
+        """Call transaction again while it fails on a database locked by another connection, busy_retries times."""
+        for retry in range(self._busy_retries + 1):
+            try:
+                return transaction()
+            except sqlite3.OperationalError as error:
+                if not self._is_busy(error) or retry == self._busy_retries:
+                    raise
+                if self._conn.in_transaction:
+                    self._conn.rollback()
+                logger.debug(f"group commit retries a locked transaction: {error}")
+                time.sleep(min(self._max_delay * 2 ** retry, 1.))
+
+    @staticmethod
+    def _is_busy(error: BaseException) -> bool:
+        """Whether error is a temporary lock held by another connection, not a rejected row."""
+        code = getattr(error, "sqlite_errorcode", None)
+        return code is not None and code & 0xff in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+
+
+class ConnectorMetrics:
+    """Calls, rows and latency histogram of table functions by table and operation, and slow statements.
+
+    Table functions are wrapped by ArchitectSQliteConnector.enable_metrics, slow statements are captured with
+    sqlite trace callback and progress handler.
+    """
+
+    # latency histogram upper bounds, in seconds
+    BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1., 5.)
+
+    # number of rows from the result of each operation
+    ROWS_COUNTERS = {
+        "dump_row": lambda result: 1,
+        "dump_rows": lambda result: max(result.rowcount, 0),
+        "dump_columns": lambda result: max(result.rowcount, 0),
+        "export": lambda result: result,
+        "write_blob": lambda result: 1,
+        "read_blob": lambda result: 1,
+    }
+
+    def __init__(self, slow_threshold: Optional[float] = None, max_slow_statements: int = 100):
+        """
+        :param slow_threshold: seconds from which a statement is slow, no capture if None
+        :type slow_threshold: float
+        :param max_slow_statements: number of last slow statements kept
+        :type max_slow_statements: int
+        """
+        self.slow_threshold = slow_threshold
+        self._lock = threading.Lock()
+        # [calls, rows, seconds, histogram counts] by (table, operation)
+        self._functions: Dict[tuple, list] = {}
+        self._slow_statements = collections.deque(maxlen=max_slow_statements)
+        self._slow_statements_count = 0
+        self._statement: Optional[list] = None
+
+    def wrap(self, table: str, operation: str, func: Callable) -> Callable:
+        """Wrap a table function to record its calls."""
+        count_rows = self.ROWS_COUNTERS[operation]
+
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            self.record(table, operation, time.perf_counter() - start, count_rows(result))
+            return result
+        wrapper.__wrapped__ = func
+        return wrapper
+
+    def record(self, table: str, operation: str, seconds: float, rows: int):
+        """Record a call of a table function."""
+        with self._lock:
+            metric = self._functions.get((table, operation))
+            if metric is None:
+                metric = self._functions[(table, operation)] = [0, 0, 0., [0] * (len(self.BUCKETS) + 1)]
+            metric[0] += 1
+            metric[1] += rows
+            metric[2] += seconds
+            metric[3][bisect.bisect_left(self.BUCKETS, seconds)] += 1
+
+    def trace(self, statement: str):
+        """sqlite trace callback: a statement starts."""
+        self._statement = [statement, time.perf_counter(), None]
+
+    def progress(self) -> int:
+        """sqlite progress handler: capture current statement once it runs longer than slow threshold."""
+        current = self._statement
+        if current is not None:
+            seconds = time.perf_counter() - current[1]
+            if current[2] is not None:
+                current[2]["seconds"] = seconds
+            elif seconds >= self.slow_threshold:
+                current[2] = {"statement": current[0], "seconds": seconds}
+                with self._lock:
+                    self._slow_statements.append(current[2])
+                    self._slow_statements_count += 1
+        # 0 let the statement go on
+        return 0
+
+    def stats(self, fmt: str = "dict"):
+        """Snapshot of metrics.
+
+        :param fmt: "dict", or "prometheus" for prometheus text format
+        :type fmt: str
+        :return: {"functions": {table: {operation: {"calls", "rows", "seconds", "histogram"}}}, "slow_statements"}
+            histogram counts are cumulative by upper bound, as in prometheus
+        :rtype: dict or str
+        """
+        with self._lock:
+            functions = {key: (calls, rows, seconds, list(counts))
+                         for key, (calls, rows, seconds, counts) in self._functions.items()}
+            slow_statements = [dict(statement) for statement in self._slow_statements]
+            slow_statements_count = self._slow_statements_count
+
+        bounds = [*map(str, self.BUCKETS), "+Inf"]
+        if fmt == "dict":
+            stats = {}
+            for (table, operation), (calls, rows, seconds, counts) in functions.items():
+                stats.setdefault(table, {})[operation] = {
+                    "calls": calls, "rows": rows, "seconds": seconds,
+                    "histogram": dict(zip(bounds, itertools.accumulate(counts)))}
+            return {"functions": stats, "slow_statements": slow_statements}
+
+        if fmt != "prometheus":
+            raise ValueError(f"unknown stats format '{fmt}', available: 'dict', 'prometheus'")
+
+        lines = ["# HELP architect_sqlite_calls_total Calls of table functions.",
+                 "# TYPE architect_sqlite_calls_total counter"]
+        lines.extend(f'architect_sqlite_calls_total{{table="{table}",operation="{operation}"}} {calls}'
+                     for (table, operation), (calls, *_) in functions.items())
+        lines.extend(("# HELP architect_sqlite_rows_total Rows processed by table functions.",
+                      "# TYPE architect_sqlite_rows_total counter"))
+        lines.extend(f'architect_sqlite_rows_total{{table="{table}",operation="{operation}"}} {rows}'
+                     for (table, operation), (_, rows, *_) in functions.items())
+        lines.extend(("# HELP architect_sqlite_call_seconds Latency of table functions.",
+                      "# TYPE architect_sqlite_call_seconds histogram"))
+        for (table, operation), (calls, _, seconds, counts) in functions.items():
+            labels = f'table="{table}",operation="{operation}"'
+            lines.extend(f'architect_sqlite_call_seconds_bucket{{{labels},le="{bound}"}} {count}'
+                         for bound, count in zip(bounds, itertools.accumulate(counts)))
+            lines.append(f"architect_sqlite_call_seconds_sum{{{labels}}} {seconds}")
+            lines.append(f"architect_sqlite_call_seconds_count{{{labels}}} {calls}")
+        lines.extend(("# HELP architect_sqlite_slow_statements_total Statements slower than threshold.",
+                      "# TYPE architect_sqlite_slow_statements_total counter",
+                      f"architect_sqlite_slow_statements_total {slow_statements_count}"))
+        return "\\n".join(lines) + "\\n"
+
+
+def bindable_values(values: Sequence) -> Sequence:
+    """Column values that sqlite3 can bind.
+
+    NumPy arrays hold NumPy scalars that sqlite3 does not bind: they are converted to python values at C speed with
+    tolist. NumPy is not imported, other sequences are returned as is.
+    """
+    if type(values).__module__ == "numpy" and hasattr(values, "tolist"):
+        return values.tolist()
+    return values
+
+
+def csv_value_coercer(column_type: str, not_null: bool) -> Callable[[str], Any]:
+    """Function converting a csv value to a column value.
+
+    An empty value is NULL for a column accepting NULL, an empty text for a NOT NULL TEXT column. BLOB values are
+    read in base64, as written by ArchitectSQliteConnector.export_table.
+
+    :param column_type: sqlite type of column
+    :type column_type: str
+    :param not_null: column is NOT NULL
+    :type not_null: bool
+    :return: converter
+    :rtype: Callable[[str], Any]
+    """
+    convert = {
+        "INTEGER": int,
+        "REAL": float,
+        "BLOB": binascii.a2b_base64,
+    }.get(column_type, str)
+
+    if not not_null:
+        return lambda value: convert(value) if value else None
+    return convert
+
+
+def last_key_request(table: str, schema: str = "main") -> str:
+    """Query of the greatest generated primary key used in a table of TABLES_ROWID_ALIAS, 0 if none.
+
+    For an AUTOINCREMENT table, keys of deleted rows are taken into account with sqlite_sequence.
+    """
+    req = f"SELECT COALESCE(MAX({TABLES_ROWID_ALIAS[table]}), 0) FROM {schema}.{table}"
+    if table in TABLES_AUTOINCREMENT:
+        req = f"SELECT MAX(({req}), COALESCE((SELECT seq FROM {schema}.sqlite_sequence WHERE name = '{table}'), 0))"
+    return f"{req};"
+
+
+def parallel_load_worker(shard_path: str, items: List[Any], prepare: Callable):
+    """Dump rows prepared from items in a new database file, see ArchitectSQliteConnector.parallel_load."""
+    connector = ArchitectSQliteConnector(shard_path, True)
+    # shard is a temporary file: no need to survive a crash
+    connector.conn.execute("PRAGMA journal_mode = OFF;")
+    connector.conn.execute("PRAGMA synchronous = OFF;")
+    for item in items:
+        prepare(connector, item)
+    connector.close()
+    return shard_path
+
+
 class ArchitectSQliteConnector:
 
-    def __init__(self, filepath: str, erase_if_exists: bool, create: bool = True, **kwargs):
+    def __init__(self, filepath: str, erase_if_exists: bool, create: bool = True, staging: Optional[str] = None,
+                 **kwargs):
+        """
+        :param filepath: database file path, or ':memory:'
+        :type filepath: str
+        :param erase_if_exists: remove database file if it exists
+        :type erase_if_exists: bool
+        :param create: run creation script
+        :type create: bool
+        :param staging: build a new database in ':memory:' or in this temporary file path, then copy it to filepath
+            with persist
+        :type staging: str
+        :param kwargs: sqlite3.connect arguments
+        """
 
         if filepath != ':memory:':
             if os.path.isfile(filepath) and erase_if_exists:
                 os.remove(filepath)
 
-        self.conn = sqlite3.connect(filepath, **kwargs)
+        if staging is not None and (filepath == ':memory:' or os.path.isfile(filepath)):
+            raise ValueError("staging mode builds a new database file")
+
+        self.filepath = filepath
+        self._connect_kwargs = kwargs
+        self._group_writer: Optional[GroupCommitWriter] = None
+        self._bulk_load_tables: Optional[set] = None
+        self._staging = staging
+        self.metrics: Optional[ConnectorMetrics] = None
+        self._progress_steps = 0
+
+        self.conn = sqlite3.connect(filepath if staging is None else staging, **kwargs)
+
+        if staging is not None and staging != ':memory:':
+            # staging file is temporary: no need to survive a crash
+            self.conn.execute("PRAGMA journal_mode = OFF;")
+            self.conn.execute("PRAGMA synchronous = OFF;")
 
-        if create or erase_if_exists:
+        if create or erase_if_exists or staging is not None:
             self.conn.executescript(SQLITE_CREATION_SCRIPT)
         self.conn.execute("PRAGMA foreign_keys = ON;")
+
+    def start_group_commit(self, max_rows: int = 1000, max_delay: float = 0.05, max_pending: int = 10000,
+                           busy_timeout: float = 5., busy_retries: int = 5):
+        """Send single row dumps to a background writer committing them by group.
+
+        Once started, _dump_row_* functions return a concurrent.futures.Future instead of a cursor, see
+        GroupCommitWriter.put. Other functions still use this connection: they commit after each call so that the
+        writer is never locked out, and they need a flush before if they depend on queued rows. A bulk load can not
+        run meanwhile.
+
+        :param max_rows: number of pending rows triggering a commit
+        :type max_rows: int
+        :param max_delay: seconds between first pending row and commit
+        :type max_delay: float
+        :param max_pending: queue size, _dump_row_* functions block when queue is full
+        :type max_pending: int
+        :param busy_timeout: seconds a writer statement waits for a lock held by another connection
+        :type busy_timeout: float
+        :param busy_retries: number of times a group is retried while database is still locked after busy_timeout
+        :type busy_retries: int
+        """
+        if self.filepath == ':memory:':
+            raise ValueError("group commit needs a database file, not ':memory:'")
+        if self._staging is not None:
+            raise ValueError("group commit needs the database file, call persist before")
+        if self._bulk_load_tables is not None:
+            raise RuntimeError("group commit can not start during a bulk load")
+
+        if self._group_writer is None:
+            self.conn.commit()
+            self._group_writer = GroupCommitWriter(self.filepath, max_rows, max_delay, max_pending, busy_timeout,
+                                                   busy_retries, **self._connect_kwargs)
+
+    def flush(self):
+        """Commit current transaction, then rows queued in group commit writer.
+
+        When it returns, every row dumped before is committed, or rejected by the group commit writer.
+
+        :raise GroupCommitError: rows were rejected by the group commit writer since last flush
+        """
+        self.conn.commit()
+        if self._group_writer is not None:
+            self._group_writer.flush()
+
+    def close(self):
+        """Flush and stop group commit writer, then commit and close connection.
+
+        :raise GroupCommitError: rows were rejected by the group commit writer since last flush
+        """
+        try:
+            if self._group_writer is not None:
+                self._group_writer.close()
+        finally:
+            self._group_writer = None
+            if self._staging is not None:
+                self.persist()
+            self.conn.commit()
+            self.conn.close()
+
+    def _release_write_lock(self):
+        """Commit current transaction while group commit writer runs, so that it can write."""
+        if self._group_writer is not None:
+            self.conn.commit()
+
+    def persist(self, pages: int = 65536, vacuum: bool = False):
+        """Copy the staging database to filepath, then use filepath.
+
+        Copy is made with sqlite online backup, pages by pages, or with VACUUM INTO to write a compact file. A
+        staging file is removed after the copy.
+
+        :param pages: number of pages copied by backup step, -1 to copy all pages at once
+        :type pages: int
+        :param vacuum: copy with VACUUM INTO instead of backup
+        :type vacuum: bool
+        """
+        if self._staging is None:
+            raise RuntimeError("no staging database to persist")
+
+        self.conn.commit()
+        if vacuum:
+            self.conn.execute("VACUUM INTO ?;", (self.filepath,))
+        else:
+            target = sqlite3.connect(self.filepath)
+            try:
+                self.conn.backup(target, pages=pages)
+            finally:
+                target.close()
+        self.conn.close()
+
+        if self._staging != ':memory:':
+            os.remove(self._staging)
+        self._staging = None
+
+        self.conn = sqlite3.connect(self.filepath, **self._connect_kwargs)
+        self.conn.execute("PRAGMA foreign_keys = ON;")
+        self._set_metrics_callbacks()
+
+    def enable_metrics(self, slow_threshold: Optional[float] = None, progress_steps: int = 10000,
+                       tables: Optional[Iterable[str]] = None) -> ConnectorMetrics:
+        """Record calls of table functions in metrics, and optionally statements slower than a threshold.
+
+        Table functions of this connector are replaced by wrapped functions: nothing is recorded, and nothing is
+        added to calls, while metrics are disabled. With a package, functions of every instrumented table are
+        imported.
+
+        :param slow_threshold: seconds from which a statement is slow, no capture if None
+        :type slow_threshold: float
+        :param progress_steps: sqlite virtual machine instructions between two checks of current statement duration
+        :type progress_steps: int
+        :param tables: tables name to instrument, every table if None
+        :type tables: Iterable[str]
+        :return: metrics, see stats
+        :rtype: ConnectorMetrics
+        """
+        self.disable_metrics()
+        self.metrics = ConnectorMetrics(slow_threshold)
+
+        for table in TABLES_COLUMNS if tables is None else tables:
+            fcn_name = table.lower()
+            functions = {f"_dump_row_{fcn_name}": "dump_row",
+                         f"_dump_rows_{fcn_name}": "dump_rows",
+                         f"_dump_columns_{fcn_name}": "dump_columns",
+                         f"_export_{fcn_name}": "export"}
+            for column in TABLES_BLOB_COLUMNS.get(table, ()):
+                functions[f"_write_blob_{fcn_name}_{column.lower()}"] = "write_blob"
+                functions[f"_read_blob_{fcn_name}_{column.lower()}"] = "read_blob"
+
+            for name, operation in functions.items():
+                func = getattr(self, name, None)
+                if func is not None:
+                    # instance attribute hides class function
+                    setattr(self, name, self.metrics.wrap(table, operation, func))
+
+        self._progress_steps = progress_steps
+        self._set_metrics_callbacks()
+
+        return self.metrics
+
+    def disable_metrics(self):
+        """Restore table functions and remove sqlite callbacks set by enable_metrics."""
+        if self.metrics is None:
+            return
+
+        for name, value in list(vars(self).items()):
+            if hasattr(value, "__wrapped__"):
+                delattr(self, name)
+        self.metrics = None
+        self._set_metrics_callbacks()
+
+    def _set_metrics_callbacks(self):
+        """Set sqlite callbacks capturing slow statements on current connection, or remove them."""
+        if self.metrics is not None and self.metrics.slow_threshold is not None:
+            self.conn.set_trace_callback(self.metrics.trace)
+            self.conn.set_progress_handler(self.metrics.progress, self._progress_steps)
+        else:
+            self.conn.set_trace_callback(None)
+            self.conn.set_progress_handler(None, 0)
+
+    def stats(self, fmt: str = "dict"):
+        """Snapshot of metrics, see ConnectorMetrics.stats.
+
+        :raise RuntimeError: metrics are not enabled
+        """
+        if self.metrics is None:
+            raise RuntimeError("metrics are not enabled, see enable_metrics")
+        return self.metrics.stats(fmt)
+
+    def dump_columns(self, table: str, columns: Mapping[str, Sequence], or_x: str = "FAIL") -> sqlite3.Cursor:
+        """Dump rows given as one sequence of values by column.
+
+        Rows are zipped from columns while executemany inserts them: no row is built in advance. Missing columns are
+        inserted as NULL, they can not be NOT NULL except a generated primary key. Sequences can be lists,
+        array.array or NumPy arrays, see bindable_values.
+
+        :param table: table name
+        :type table: str
+        :param columns: values of each column by column name
+        :type columns: Mapping[str, Sequence]
+        :param or_x: action to perform if insert fail, available: "ROLLBACK", "ABORT", "FAIL", "IGNORE", and "REPLACE"
+        :type or_x: str
+        :return: Cursor
+        :rtype: sqlite3.Cursor
+        :raise ValueError: unknown or missing NOT NULL column, or columns with different lengths
+        """
+        table_columns = TABLES_COLUMNS[table]
+        unknown_columns = set(columns).difference(table_columns)
+        if unknown_columns:
+            raise ValueError(f"unknown columns {sorted(unknown_columns)} in table {table}")
+        missing_columns = set(TABLES_NOT_NULL_COLUMNS.get(table, ())).difference(columns)
+        if missing_columns:
+            raise ValueError(f"missing NOT NULL columns {sorted(missing_columns)} in table {table}")
+
+        lengths = {column: len(values) for column, values in columns.items()}
+        if len(set(lengths.values())) > 1:
+            raise ValueError(f"columns must have the same length: {lengths}")
+        length = next(iter(lengths.values()), 0)
+
+        sequences = [bindable_values(columns[column]) if column in columns else itertools.repeat(None, length)
+                     for column in table_columns]
+
+        if self._bulk_load_tables is not None:
+            self._bulk_load_tables.add(table)
+        req = SqLiteRequestBuilder.set_insert_or_x_request(table, table_columns, or_x)
+        cursor = self.conn.executemany(req, zip(*sequences))
+        self._release_write_lock()
+        return cursor
+
+    def begin_bulk_load(self):
+        """Disable foreign keys enforcement on this connection until end_bulk_load.
+
+        Rows dumped meanwhile are kept in one transaction and can be inserted in any order, their foreign keys are
+        checked once by end_bulk_load. Rows sent to the group commit writer are not part of the bulk load.
+        """
+        if self._bulk_load_tables is not None:
+            raise RuntimeError("bulk load already started")
+        if self._group_writer is not None:
+            raise RuntimeError("bulk load keeps a write transaction: it can not start during group commit")
+
+        # foreign keys enforcement can not be changed inside a transaction
+        self.conn.commit()
+        self.conn.execute("PRAGMA foreign_keys = OFF;")
+        self._bulk_load_tables = set()
+
+    def end_bulk_load(self, keep_violations: bool = False) -> Dict[str, List[dict]]:
+        """Check foreign keys of tables touched by the bulk load, then commit or rollback it.
+
+        :param keep_violations: commit rows even if foreign keys are violated
+        :type keep_violations: bool
+        :return: foreign key violations by table, see foreign_key_check
+        :rtype: Dict[str, List[dict]]
+        """
+        if self._bulk_load_tables is None:
+            raise RuntimeError("no bulk load started")
+
+        tables, self._bulk_load_tables = self._bulk_load_tables, None
+        try:
+            violations = self.foreign_key_check(tables)
+            if violations and not keep_violations:
+                self.conn.rollback()
+            else:
+                self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            raise
+        finally:
+            self.conn.execute("PRAGMA foreign_keys = ON;")
+
+        return violations
+
+    @contextmanager
+    def bulk_load(self, keep_violations: bool = False):
+        """Context manager around begin_bulk_load and end_bulk_load.
+
+        It yields a dictionary filled with foreign key violations when leaving the context. The bulk load is rolled
+        back if an exception is raised inside the context.
+
+        :param keep_violations: commit rows even if foreign keys are violated
+        :type keep_violations: bool
+        """
+        violations = {}
+        self.begin_bulk_load()
+        try:
+            yield violations
+        except BaseException:
+            self._bulk_load_tables = None
+            self.conn.rollback()
+            self.conn.execute("PRAGMA foreign_keys = ON;")
+            raise
+        violations.update(self.end_bulk_load(keep_violations))
+
+    def foreign_key_check(self, tables: Optional[Iterable[str]] = None) -> Dict[str, List[dict]]:
+        """Check foreign keys of rows inserted in tables in one pass.
+
+        Only given tables with a foreign key are checked: rows inserted in a parent table can not break the foreign
+        keys of its children.
+
+        :param tables: tables name, all tables if None
+        :type tables: Iterable[str]
+        :return: for each table with violations, one dictionary by violated foreign key with keys "columns",
+            "parent", "parent_columns" and "rowids" (rowid of violating rows)
+        :rtype: Dict[str, List[dict]]
+        """
+        tables = set(TABLES_COLUMNS if tables is None else tables)
+
+        violations = {}
+        for table in TABLES_FOREIGN_KEYS:
+            if table not in tables:
+                continue
+
+            rows = self.conn.execute(f"PRAGMA foreign_key_check({table});").fetchall()
+            if not rows:
+                continue
+
+            # a foreign key can be made of several columns, each one with its own line and the same id
+            fk_columns = {}
+            for fk_id, _, parent, column, parent_column, *_ in self.conn.execute(f"PRAGMA foreign_key_list({table});"):
+                fk = fk_columns.setdefault(fk_id, {"columns": [], "parent": parent, "parent_columns": [],
+                                                   "rowids": []})
+                fk["columns"].append(column)
+                fk["parent_columns"].append(parent_column)
+
+            for _, rowid, _, fk_id in rows:
+                fk_columns[fk_id]["rowids"].append(rowid)
+            violations[table] = [fk for fk in fk_columns.values() if fk["rowids"]]
+
+        return violations
+
+    def parallel_load(self, items: Iterable[Any], prepare: Callable, processes: Optional[int] = None) -> Dict[str, int]:
+        """Prepare and dump rows in a pool of processes, then merge them in this database.
+
+        Items are split in one contiguous part by process. Each process calls prepare(connector, item) for each item
+        of its part, with a connector on its own temporary database file. Shards are then attached together and
+        merged in one transaction, in relation order: nothing is merged if a shard fails. Generated primary keys, and
+        foreign keys referencing them, are shifted so that they follow the keys already in this database. Shards
+        start empty: rows dumped by prepare can only reference rows dumped in the same process.
+
+        :param items: items to prepare, sent to processes: they must be picklable
+        :type items: Iterable[Any]
+        :param prepare: function dumping rows for an item with _dump_row(s)_* functions, it must be picklable
+        :type prepare: Callable[[ArchitectSQliteConnector, Any], None]
+        :param processes: number of processes, default os.cpu_count(), at most the number of databases which can be
+            attached to this connection
+        :type processes: int
+        :return: number of rows merged in each table
+        :rtype: Dict[str, int]
+        :raise RuntimeError: a bulk load or group commit is running
+        """
+        # merge commits the current transaction and writes with this connection
+        if self._bulk_load_tables is not None:
+            raise RuntimeError("parallel load commits its merge: it can not run during a bulk load")
+        if self._group_writer is not None:
+            raise RuntimeError("parallel load commits its merge: it can not run during group commit")
+
+        items = list(items)
+        processes = min(processes or os.cpu_count() or 1, max(len(items), 1), self._attach_limit())
+        part_size = -(-len(items) // processes)
+        parts = [items[i:i + part_size] for i in range(0, len(items), part_size)]
+
+        tmp_dir = None if self.filepath == ':memory:' else os.path.dirname(os.path.abspath(self.filepath))
+        with tempfile.TemporaryDirectory(dir=tmp_dir) as shards_dir:
+            shards_path = [os.path.join(shards_dir, f"shard_{i}.sqlite") for i in range(len(parts))]
+            with ProcessPoolExecutor(processes) as executor:
+                shards_path = list(executor.map(parallel_load_worker, shards_path, parts,
+                                                [prepare] * len(parts)))
+
+            return self._merge_shards(shards_path)
+
+    def _attach_limit(self) -> int:
+        """Number of databases which can still be attached to this connection."""
+        limit = self.conn.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED)
+        attached = sum(name not in ("main", "temp") for _, name, _ in self.conn.execute("PRAGMA database_list;"))
+        return max(limit - attached, 1)
+
+    def _merge_shards(self, shards_path: List[str]) -> Dict[str, int]:
+        """Insert rows of database files in this one in one transaction, shifting generated primary keys.
+
+        :return: number of rows merged in each table
+        :rtype: Dict[str, int]
+        """
+        rows_count = dict.fromkeys(TABLES_COLUMNS, 0)
+        # ATTACH and DETACH can not be used inside a transaction
+        self.conn.commit()
+        schemas = []
+        try:
+            for i, shard_path in enumerate(shards_path):
+                self.conn.execute(f"ATTACH DATABASE ? AS shard_{i};", (shard_path,))
+                schemas.append(f"shard_{i}")
+
+            with self.conn:
+                for schema in schemas:
+                    offsets = {}
+                    for table, columns in TABLES_COLUMNS.items():
+                        pk = TABLES_ROWID_ALIAS.get(table)
+                        if pk is not None:
+                            offsets[table] = self.conn.execute(last_key_request(table)).fetchone()[0]
+
+                        shifts = {pk: offsets[table]} if pk is not None else {}
+                        for fk_columns, parent, parent_columns in TABLES_FOREIGN_KEYS.get(table, ()):
+                            for column, parent_column in zip(fk_columns, parent_columns):
+                                if TABLES_ROWID_ALIAS.get(parent) == parent_column:
+                                    shifts[column] = offsets[parent]
+
+                        select = ", ".join(f"{col} + {shifts[col]}" if col in shifts else col for col in columns)
+                        req = f"INSERT INTO main.{table} ({', '.join(columns)}) SELECT {select} FROM {schema}.{table};"
+                        rows_count[table] += self.conn.execute(req).rowcount
+        finally:
+            for schema in schemas:
+                self.conn.execute(f"DETACH DATABASE {schema};")
+        return rows_count
+
+    def export_table(self, table: str, fp: TextIO, fmt: str = "csv", batch_size: int = 1000,
+                     conn: Optional[sqlite3.Connection] = None) -> int:
+        """Write rows of table in a text file, batch after batch.
+
+        csv format starts with a header line with columns name, jsonl format writes one json object by row. BLOB
+        values are written in base64.
+
+        :param table: table name
+        :type table: str
+        :param fp: text file object, opened with newline="" for csv
+        :type fp: TextIO
+        :param fmt: "csv" or "jsonl"
+        :type fmt: str
+        :param batch_size: number of rows fetched at once
+        :type batch_size: int
+        :param conn: connection used to read table, default this connector connection
+        :type conn: sqlite3.Connection
+        :return: number of rows written
+        :rtype: int
+        """
+        if fmt not in ("csv", "jsonl"):
+            raise ValueError(f"unknown export format '{fmt}', available: 'csv', 'jsonl'")
+
+        conn = self.conn if conn is None else conn
+        columns = TABLES_COLUMNS[table]
+        blob_indexes = {columns.index(col) for col in TABLES_BLOB_COLUMNS.get(table, ())}
+
+        def encode_blobs(_, row):
+            # each BLOB value is fetched as bytes, then encoded to base64 text: no other copy of the row is made
+            return tuple(binascii.b2a_base64(value, newline=False).decode("ascii")
+                         if value is not None and i in blob_indexes else value
+                         for i, value in enumerate(row))
+
+        if fmt == "csv":
+            writer = csv.writer(fp)
+            writer.writerow(columns)
+
+        rows_count = 0
+        cursor = conn.cursor()
+        if blob_indexes:
+            cursor.row_factory = encode_blobs
+        cursor.execute(f"SELECT {', '.join(columns)} FROM {table};")
+        while 1:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            rows_count += len(rows)
+
+            if fmt == "csv":
+                writer.writerows(rows)
+            else:
+                fp.write("".join(f"{json.dumps(dict(zip(columns, row)))}\\n" for row in rows))
+
+        return rows_count
+
+    def export_db(self, directory: str, fmt: str = "csv", batch_size: int = 1000,
+                  workers: Optional[int] = None) -> Dict[str, int]:
+        """Write rows of each table in a file named after table in directory, see export_table.
+
+        When database is in WAL mode, tables are exported concurrently, each one by its own read connection, so
+        only committed rows are exported.
+
+        :param directory: output directory, created if needed
+        :type directory: str
+        :param fmt: "csv" or "jsonl"
+        :type fmt: str
+        :param batch_size: number of rows fetched at once
+        :type batch_size: int
+        :param workers: number of threads in WAL mode, default ThreadPoolExecutor default
+        :type workers: int
+        :return: number of rows written for each table
+        :rtype: Dict[str, int]
+        """
+        os.makedirs(directory, exist_ok=True)
+        journal_mode = self.conn.execute("PRAGMA journal_mode;").fetchone()[0]
+        parallel = journal_mode.lower() == "wal" and self.filepath != ':memory:' and self._staging is None
+
+        def export(table):
+            with open(os.path.join(directory, f"{table}.{fmt}"), "w", encoding="utf-8", newline="") as fp:
+                if not parallel:
+                    return self.export_table(table, fp, fmt, batch_size)
+
+                conn = sqlite3.connect(f"file:{os.path.abspath(self.filepath)}?mode=ro", uri=True)
+                try:
+                    return self.export_table(table, fp, fmt, batch_size, conn)
+                finally:
+                    conn.close()
+
+        if not parallel:
+            return {table: export(table) for table in TABLES_COLUMNS}
+
+        with ThreadPoolExecutor(workers, thread_name_prefix="Export") as executor:
+            return dict(zip(TABLES_COLUMNS, executor.map(export, TABLES_COLUMNS)))
+
+    def write_blob(self, table: str, column: str, rowid: int, fp: BinaryIO, size: int,
+                   chunk_size: int = BLOB_CHUNK_SIZE) -> int:
+        """Copy a binary file in a BLOB column of a row, chunk by chunk.
+
+        Value is first replaced by zeroblob(size), then filled with incremental blob I/O: peak memory is chunk_size
+        whatever the size. Both happen in a savepoint, the previous value is restored if the copy fails.
+
+        :param table: table name
+        :type table: str
+        :param column: BLOB column name
+        :type column: str
+        :param rowid: rowid of the row
+        :type rowid: int
+        :param fp: binary file object with a readinto function, positioned at content start
+        :type fp: BinaryIO
+        :param size: content size in bytes
+        :type size: int
+        :param chunk_size: bytes copied at once
+        :type chunk_size: int
+        :return: number of bytes written
+        :rtype: int
+        :raise ValueError: file ends before size bytes
+        """
+        self.conn.execute("SAVEPOINT write_blob;")
+        try:
+            self.conn.execute(f"UPDATE {table} SET {column} = zeroblob(?) WHERE rowid = ?;", (size, rowid))
+
+            buffer = memoryview(bytearray(min(chunk_size, size)))
+            written = 0
+            with self.conn.blobopen(table, column, rowid) as blob:
+                while written < size:
+                    read = fp.readinto(buffer[:size - written])
+                    if not read:
+                        raise ValueError(f"file ends after {written} bytes, {size} bytes expected")
+                    blob.write(buffer[:read])
+                    written += read
+        except BaseException:
+            self.conn.execute("ROLLBACK TO write_blob;")
+            self.conn.execute("RELEASE write_blob;")
+            raise
+        self.conn.execute("RELEASE write_blob;")
+        self._release_write_lock()
+        return written
+
+    def read_blob(self, table: str, column: str, rowid: int, out: Union[BinaryIO, bytearray, memoryview],
+                  chunk_size: int = BLOB_CHUNK_SIZE) -> Optional[int]:
+        """Copy a BLOB value of a row in a binary file or a writable buffer, chunk by chunk.
+
+        :param table: table name
+        :type table: str
+        :param column: BLOB column name
+        :type column: str
+        :param rowid: rowid of the row
+        :type rowid: int
+        :param out: binary file object, or writable buffer at least as large as the value
+        :type out: BinaryIO, bytearray or memoryview
+        :param chunk_size: bytes copied at once
+        :type chunk_size: int
+        :return: value size in bytes, None if value is NULL and nothing is copied
+        :rtype: int
+        :raise ValueError: buffer is too small
+        """
+        req = f"SELECT {column} IS NULL FROM {table} WHERE rowid = ?;"
+        if (self.conn.execute(req, (rowid,)).fetchone() or (False,))[0]:
+            return None
+
+        with self.conn.blobopen(table, column, rowid, readonly=True) as blob:
+            size = len(blob)
+            if hasattr(out, "write"):
+                for _ in range(0, size, chunk_size):
+                    out.write(blob.read(chunk_size))
+            else:
+                view = memoryview(out).cast("B")
+                if len(view) < size:
+                    raise ValueError(f"buffer of {len(view)} bytes can not hold a {size} bytes value")
+                for offset in range(0, size, chunk_size):
+                    chunk = blob.read(chunk_size)
+                    view[offset:offset + len(chunk)] = chunk
+        return size
+
+    def blob_size(self, table: str, column: str, rowid: int) -> Optional[int]:
+        """Size in bytes of a BLOB value, None if value is NULL"""
+        return self.conn.execute(f"SELECT length({column}) FROM {table} WHERE rowid = ?;", (rowid,)).fetchone()[0]
+
+    def import_csv_directory(self, directory: str, batch_size: int = 1000, workers: Optional[int] = None,
+                             or_x: str = "FAIL") -> Dict[str, Dict[str, float]]:
+        """Dump rows of csv files named after tables, in relation order.
+
+        Each file starts with a header line with columns name, missing columns are inserted as NULL, see
+        csv_value_coercer for values conversion. Files are parsed concurrently by a pool of threads while this
+        connection dumps batches of rows table after table, and commits after each table unless a bulk load is
+        started.
+
+        :param directory: directory containing <table>.csv files, table name is not case sensitive
+        :type directory: str
+        :param batch_size: number of rows by executemany
+        :type batch_size: int
+        :param workers: number of parsing threads, default ThreadPoolExecutor default
+        :type workers: int
+        :param or_x: action to perform if insert fail, available: "ROLLBACK", "ABORT", "FAIL", "IGNORE", and "REPLACE"
+        :type or_x: str
+        :return: for each imported table, "rows" count, "seconds" and "rows_per_second"
+        :rtype: Dict[str, Dict[str, float]]
+        """
+        files = {os.path.splitext(name)[0].lower(): os.path.join(directory, name)
+                 for name in os.listdir(directory) if name.lower().endswith(".csv")}
+        tables = [table for table in TABLES_COLUMNS if table.lower() in files]
+
+        # bounded queues: a parser waits while its table is not dumped yet
+        batches = {table: queue.Queue(maxsize=4) for table in tables}
+        stop = threading.Event()
+
+        def parse(table):
+            try:
+                for batch in self._read_csv_batches(table, files[table.lower()], batch_size):
+                    if not put(table, batch):
+                        # writer failed: no need to parse the rest of the file
+                        return
+                put(table, None)
+            except Exception as error:
+                put(table, error)
+
+        def put(table, item) -> bool:
+            # stop waiting if writer failed
+            while not stop.is_set():
+                try:
+                    batches[table].put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        report = {}
+        with ThreadPoolExecutor(workers, thread_name_prefix="CsvImport") as executor:
+            try:
+                # tables are submitted in relation order: a table is always parsed before the tables after it
+                for table in tables:
+                    executor.submit(parse, table)
+
+                for table in tables:
+                    dump_rows = getattr(self, f"_dump_rows_{table.lower()}")
+                    rows_count = 0
+                    start = time.perf_counter()
+                    while 1:
+                        batch = batches[table].get()
+                        if batch is None:
+                            break
+                        if isinstance(batch, Exception):
+                            raise batch
+                        dump_rows(batch, or_x)
+                        self._release_write_lock()
+                        rows_count += len(batch)
+                    if self._bulk_load_tables is None:
+                        self.conn.commit()
+
+                    seconds = time.perf_counter() - start
+                    report[table] = {"rows": rows_count, "seconds": seconds,
+                                     "rows_per_second": rows_count / seconds if seconds else float(rows_count)}
+                    logger.info(f"{table}: {rows_count} rows imported, {report[table]['rows_per_second']:.0f} rows/s")
+            except BaseException:
+                if self._bulk_load_tables is None:
+                    self.conn.rollback()
+                raise
+            finally:
+                stop.set()
+
+        return report
+
+    @staticmethod
+    def _read_csv_batches(table: str, filepath: str, batch_size: int):
+        """Read a csv file as batches of rows ready to dump in table, see import_csv_directory."""
+        columns = TABLES_COLUMNS[table]
+        # process wide setting
+        if csv.field_size_limit() < CSV_FIELD_SIZE_LIMIT:
+            csv.field_size_limit(CSV_FIELD_SIZE_LIMIT)
+        with open(filepath, "r", encoding="utf-8", newline="") as fp:
+            reader = csv.reader(fp)
+            header = next(reader, None)
+            if header is None:
+                return
+
+            unknown_columns = set(header).difference(columns)
+            if unknown_columns:
+                raise ValueError(f"{filepath}: unknown columns {sorted(unknown_columns)} in table {table}")
+
+            # (position in csv line, converter) of each column, missing columns are NULL
+            not_null_columns = TABLES_NOT_NULL_COLUMNS.get(table, ())
+            converters = [(header.index(column), csv_value_coercer(column_type, column in not_null_columns))
+                          if column in header else (0, lambda value: None)
+                          for column, column_type in zip(columns, TABLES_COLUMNS_TYPE[table])]
+
+            batch = []
+            for line in reader:
+                if not line:
+                    continue
+                try:
+                    batch.append(tuple(convert(line[i]) for i, convert in converters))
+                except (ValueError, IndexError, binascii.Error) as error:
+                    raise ValueError(f"{filepath} line {reader.line_num}: {error}") from None
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
         '''
+        return dump_class
+
+    @staticmethod
+    def _shard_columns(db: DB, shard_by: str) -> Tuple[Dict[str, str], Tuple[str, ...]]:
+        """Find the column used to choose the shard of each table's rows.
+
+        The shard column of the table named in shard_by is the given column. Then a table with a foreign key
+        referencing a sharded table is stored on the same shard as the referenced row: either the foreign key
+        references the shard column and gives the same value, or it references a generated primary key, allocated
+        by the sharded connector so that the key gives its shard. Other tables are replicated on every shard.
+
+        :param db: Database object
+        :type db: DB
+        :param shard_by: "table.column"
+        :type shard_by: str
+        :return: shard column name of each sharded table, and sharded tables whose shard column references a
+            generated primary key
+        :rtype: Tuple[Dict[str, str], Tuple[str, ...]]
+        :raise ValueError: unknown column, or a replicated table references a sharded table
+        """
+        table_name, _, column_name = shard_by.partition(".")
+        root_columns = [col for table in db.tables.values() if table.name == table_name
+                        for col in table.columns.values() if col.name == column_name]
+        if len(root_columns) != 1:
+            raise ValueError(f"shard column '{shard_by}' not found")
+
+        # column key of shard columns by table key
+        shard_columns = {next(t.key for t in db.tables.values() if t.name == table_name): root_columns[0]}
+        parent_key_tables = []
+        new_column = True
+        while new_column:
+            new_column = False
+            for table in db.tables.values():
+                if table.key in shard_columns:
+                    continue
+                # a column of a multi-column foreign key holds the same value as the referenced column
+                fk_pairs = [(col, parent, parent_col) for columns, parent, parent_columns in table.foreign_keys()
+                            if parent.key in shard_columns for col, parent_col in zip(columns, parent_columns)]
+                for col, parent, parent_col in fk_pairs:
+                    if shard_columns[parent.key] is parent_col:
+                        shard_columns[table.key] = col
+                    elif parent.generated_primary_key() is parent_col:
+                        shard_columns[table.key] = col
+                        parent_key_tables.append(table.name)
+                    else:
+                        continue
+                    new_column = True
+                    break
 
-        tables_to_dump = []
         for table in db.tables.values():
-            tables_to_dump.append(cls._dump_table(table))
-        tables_str = "\n".join(tables_to_dump)
-        return f'{dump_class}{tables_str}\n'
+            if table.key in shard_columns:
+                continue
+            for fk_table_key in table.foreign_tables_key():
+                if fk_table_key in shard_columns:
+                    raise ValueError(f"table '{table.name}' references sharded table "
+                                     f"'{db.tables[fk_table_key].name}' without referencing its shard column or its "
+                                     f"generated primary key, rows could not be stored on the same shard")
+
+        return {db.tables[k].name: col.name for k, col in shard_columns.items()}, tuple(parent_key_tables)
+
+    @classmethod
+    def _dump_sharded_connector(cls, shard_columns: Dict[str, str], parent_key_tables: Tuple[str, ...] = ()) -> str:
+        """Create a connector spreading rows over several database files, without table functions.
+
+        :param shard_columns: shard column name of each sharded table
+        :type shard_columns: Dict[str, str]
+        :param parent_key_tables: sharded tables whose shard column references a generated primary key
+        :type parent_key_tables: Tuple[str, ...]
+        :return: connector class
+        :rtype: str
+        """
+        columns_lines = (f'    "{table}": "{column}",' for table, column in shard_columns.items())
+        columns_str = "\n".join(columns_lines)
+
+        dump_class = f'''# column choosing the shard of each table's rows. Rows of other tables are replicated on every
+# shard.
+SHARD_COLUMNS = {{
+{columns_str}
+}}
+
+# sharded tables whose shard column references a generated primary key of a sharded table: the key gives the
+# shard of the referenced row, see ShardedArchitectSQliteConnector.shard_of_key
+SHARD_PARENT_KEY_TABLES = {parent_key_tables!r}
+''' + '''
+
+class ShardedArchitectSQliteConnector:
+    """Spread rows over several database files, one ArchitectSQliteConnector by file.
+
+    The shard of a row is given by the value of its table's column in SHARD_COLUMNS: a hash of the value, or its
+    range if boundaries are given. Rows referencing each other through this column are stored on the same shard,
+    rows of other tables are replicated on every shard. Shards are written concurrently, each one by its own
+    connection.
+
+    Generated primary keys of sharded tables are allocated by the connector so that a key is unique across shards
+    and gives the shard of its row, see shard_of_key. Rows of tables in SHARD_PARENT_KEY_TABLES are stored on the
+    shard of the key they reference. When the shard column is the generated primary key itself, a new row goes to
+    the next shard in turn, unless boundaries are given: the key is then required.
+
+    Rows of a replicated table are written on every shard in a savepoint, undone on every shard if one fails.
+    """
+
+    def __init__(self, filepaths: List[str], erase_if_exists: bool, create: bool = True,
+                 boundaries: Optional[List[Any]] = None, **kwargs):
+        """
+        :param filepaths: one file path by shard
+        :type filepaths: List[str]
+        :param boundaries: sorted shard column values where a shard starts, len(filepaths) - 1 values. Shards are
+            chosen by hash if None
+        :type boundaries: List[Any]
+        :param kwargs: sqlite3.connect arguments
+        """
+        if boundaries is not None and len(boundaries) != len(filepaths) - 1:
+            raise ValueError(f"{len(filepaths)} shards need {len(filepaths) - 1} boundaries, not {len(boundaries)}")
+
+        # each shard connection is used by the thread pool
+        kwargs["check_same_thread"] = False
+        self.shards = [ArchitectSQliteConnector(filepath, erase_if_exists, create, **kwargs)
+                       for filepath in filepaths]
+        self._locks = [threading.Lock() for _ in filepaths]
+        self._boundaries = boundaries
+        self._executor = ThreadPoolExecutor(len(filepaths), thread_name_prefix="Shard")
+        self._shard_index = {table: TABLES_COLUMNS[table].index(column) for table, column in SHARD_COLUMNS.items()}
+        # position of primary keys allocated by this connector
+        self._key_index = {table: TABLES_COLUMNS[table].index(pk) for table, pk in TABLES_ROWID_ALIAS.items()
+                           if table in SHARD_COLUMNS}
+        self._next_keys: Dict[tuple, int] = {}
+        self._keys_lock = threading.Lock()
+        # shard of the next row whose shard column is its generated primary key
+        self._next_shard = itertools.count()
+
+    def shard_of(self, value: Any) -> int:
+        """Index of the shard storing rows with this shard column value.
+
+        :raise ValueError: value is None
+        """
+        if value is None:
+            raise ValueError("shard column value is required to choose a shard")
+
+        if self._boundaries is not None:
+            return bisect.bisect_right(self._boundaries, value)
+
+        # builtin hash is not stable between processes
+        if isinstance(value, int):
+            return value % len(self.shards)
+        if not isinstance(value, bytes):
+            value = str(value).encode("utf-8")
+        return zlib.crc32(value) % len(self.shards)
+
+    def shard_of_key(self, key: int) -> int:
+        """Index of the shard storing the row with this generated primary key, see allocate_key.
+
+        :raise ValueError: key is not an integer
+        """
+        if not isinstance(key, int):
+            raise ValueError(f"generated primary key {key!r} is required to choose a shard")
+        return key % len(self.shards)
+
+    def allocate_key(self, table: str, shard: int, key: Optional[int] = None) -> int:
+        """Generated primary key of a new row of table on a shard.
+
+        Keys of a shard are equal to its index modulo the number of shards, so that they are unique across shards.
+        A new key follows the greatest key of the shard, a given key is checked.
+
+        :param table: table name, in TABLES_ROWID_ALIAS
+        :type table: str
+        :param shard: shard index
+        :type shard: int
+        :param key: given key, a new key is allocated if None
+        :type key: int
+        :return: key
+        :rtype: int
+        :raise ValueError: given key does not belong to the shard
+        """
+        count = len(self.shards)
+        with self._keys_lock:
+            next_key = self._next_keys.get((table, shard))
+            if next_key is None:
+                max_key = self._execute(shard, last_key_request(table), ()).fetchone()[0]
+                next_key = max_key + 1 + (shard - max_key - 1) % count
+
+            if key is None:
+                key = next_key
+            elif self.shard_of_key(key) != shard:
+                raise ValueError(f"key {key} of table {table} is not stored on shard {shard}: it must be equal to "
+                                 f"{shard} modulo {count}")
+            self._next_keys[(table, shard)] = max(next_key, key + count)
+        return key
+
+    def _place_row(self, table: str, row: tuple):
+        """Shard of a row of a sharded table, and row with its allocated primary key."""
+        value = row[self._shard_index[table]]
+        key_index = self._key_index.get(table)
+        if key_index == self._shard_index[table]:
+            if self._boundaries is not None:
+                # allocated keys do not follow boundaries
+                return self.shard_of(value), row
+            shard = next(self._next_shard) % len(self.shards) if value is None else self.shard_of_key(value)
+        elif table in SHARD_PARENT_KEY_TABLES:
+            shard = self.shard_of_key(value)
+        else:
+            shard = self.shard_of(value)
+
+        if key_index is not None:
+            row = (*row[:key_index], self.allocate_key(table, shard, row[key_index]), *row[key_index + 1:])
+        return shard, row
+
+    def dump_row(self, table: str, row: tuple) -> sqlite3.Cursor:
+        """Dump a row in table on its shard, or on every shard for a replicated table.
+
+        :param table: table name
+        :type table: str
+        :param row: row values, in the same order as in TABLES_COLUMNS
+        :type row: tuple
+        :return: Cursor of the row shard, first shard for a replicated table
+        :rtype: sqlite3.Cursor
+        """
+        req = SqLiteRequestBuilder.set_insert_or_x_request(table, TABLES_COLUMNS[table], "FAIL")
+        if table not in self._shard_index:
+            return self._replicate(req, row)[0]
+
+        shard, row = self._place_row(table, row)
+        return self._execute(shard, req, row)
+
+    def dump_rows(self, table: str, rows: Iterable[tuple], or_x: str = "FAIL") -> int:
+        """Dump rows in table, shards are written concurrently.
+
+        :param table: table name
+        :type table: str
+        :param rows: rows values, in the same order as in TABLES_COLUMNS
+        :type rows: Iterable[tuple]
+        :param or_x: action to perform if insert fail, available: "ROLLBACK", "ABORT", "FAIL", "IGNORE", and "REPLACE"
+        :type or_x: str
+        :return: number of rows written, rows of a replicated table are counted on each shard
+        :rtype: int
+        """
+        req = SqLiteRequestBuilder.set_insert_or_x_request(table, TABLES_COLUMNS[table], or_x)
+        if table not in self._shard_index:
+            return sum(cursor.rowcount for cursor in self._replicate(req, list(rows), many=True))
+
+        rows_by_shard = {}
+        for row in rows:
+            shard, row = self._place_row(table, row)
+            rows_by_shard.setdefault(shard, []).append(row)
+
+        counts = self._executor.map(lambda i: self._execute(i, req, rows_by_shard[i], many=True).rowcount,
+                                    rows_by_shard)
+        return sum(counts)
+
+    def select(self, req: str, parameters: Iterable[Any] = (), key: Optional[Callable] = None) -> List[tuple]:
+        """Run a query on every shard concurrently and merge results.
+
+        Rows are concatenated shard after shard. With key, each shard result must be sorted by key (ORDER BY) and
+        rows are merged in key order. A query on a replicated table returns each row once by shard.
+
+        :param req: sqlite query
+        :type req: str
+        :param parameters: query parameters
+        :type parameters: Iterable[Any]
+        :param key: sort key of rows
+        :type key: Callable[[tuple], Any]
+        :return: rows of every shard
+        :rtype: List[tuple]
+        """
+        results = self._executor.map(lambda i: self._execute(i, req, parameters).fetchall(),
+                                     range(len(self.shards)))
+        if key is None:
+            return list(itertools.chain.from_iterable(results))
+        return list(heapq.merge(*results, key=key))
+
+    def commit(self):
+        """Commit every shard."""
+        list(self._executor.map(lambda i: self.shards[i].conn.commit(), range(len(self.shards))))
+
+    def close(self):
+        """Commit and close every shard."""
+        self._executor.shutdown()
+        for shard in self.shards:
+            shard.close()
+
+    def _execute(self, index: int, req: str, parameters, many: bool = False) -> sqlite3.Cursor:
+        with self._locks[index]:
+            conn = self.shards[index].conn
+            return conn.executemany(req, parameters) if many else conn.execute(req, parameters)
+
+    def _replicate(self, req: str, parameters, many: bool = False) -> List[sqlite3.Cursor]:
+        """Run an insert on every shard concurrently, in a savepoint undone on every shard if one fails.
+
+        Every shard lock is held meanwhile, so that no other statement joins the savepoints.
+        """
+        def write(conn):
+            if not conn.in_transaction:
+                # releasing the savepoint must not commit
+                conn.execute("BEGIN;")
+            conn.execute("SAVEPOINT replicate;")
+            try:
+                return conn.executemany(req, parameters) if many else conn.execute(req, parameters)
+            except BaseException:
+                end(conn, rollback=True)
+                raise
+
+        def end(conn, rollback=False):
+            # an OR ROLLBACK conflict already ended the transaction with its savepoint
+            if conn.in_transaction:
+                if rollback:
+                    conn.execute("ROLLBACK TO replicate;")
+                conn.execute("RELEASE replicate;")
+
+        conns = [shard.conn for shard in self.shards]
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            futures = [self._executor.submit(write, conn) for conn in conns]
+            errors = [future.exception() for future in futures]
+            failed = any(error is not None for error in errors)
+            for conn, error in zip(conns, errors):
+                if error is None:
+                    end(conn, rollback=failed)
+        finally:
+            for lock in self._locks:
+                lock.release()
+
+        for error in errors:
+            if error is not None:
+                raise error
+        return [future.result() for future in futures]
+'''
+
+        return dump_class
+
+    @classmethod
+    def _dump_sharded_table(cls, table: DbTable, sharded: bool) -> str:
+        """Create sharded connector functions to dump one or more row in table.
+
+        :return: functions for table
+        :rtype: str
+        """
+        fcn_name = table.name.lower()
+        pk = table.generated_primary_key()
+        cols_name_no_pk = [col for col in cls._insert_columns(table) if pk is None or col != pk.name]
+
+        # generated primary key can be given as keyword: it is allocated by the connector for a sharded table,
+        # unless it is the shard column and shards have boundaries
+        params = list(cols_name_no_pk)
+        values = list(cols_name_no_pk)
+        if pk is not None:
+            params.extend(("*", f"{pk.name}=None"))
+            values.insert(0, pk.name)
+        where = "on its shard" if sharded else "on every shard"
+
+        fcn = f'''
+    @args_logger_decorator
+    def _dump_row_{fcn_name}(self, {", ".join(params)}):
+        """Dump a row in table {table.name} {where}"""
+        return self.dump_row("{table.name}", ({", ".join(values)},))
+
+    @args_logger_decorator
+    def _dump_rows_{fcn_name}(self, rows, or_x="FAIL"):
+        """Dump rows in table {table.name} {where}, see dump_rows"""
+        return self.dump_rows("{table.name}", rows, or_x)'''
+
+        return fcn
+
+    @classmethod
+    def _dump_tables_metadata(cls, db: DB) -> str:
+        """Create dictionaries describing tables, tables are in relation order.
+
+        :return: python dictionaries
+        :rtype: str
+        """
+        tables = db.tables_in_relation_order()
+
+        columns_lines = (f'    "{table.name}": {cls._insert_columns(table)},' for table in tables)
+        columns_str = "\n".join(columns_lines)
+
+        fk_lines = []
+        for table in tables:
+            fks = tuple((tuple(col.name for col in columns), parent.name, tuple(col.name for col in parent_columns))
+                        for columns, parent, parent_columns in table.foreign_keys())
+            if fks:
+                fk_lines.append(f'    "{table.name}": {fks},')
+        fk_str = "\n".join(fk_lines)
+
+        rowid_lines = []
+        autoincrement_tables = []
+        for table in tables:
+            pk = table.generated_primary_key()
+            if pk is not None:
+                rowid_lines.append(f'    "{table.name}": "{pk.name}",')
+                if pk.autoincrement:
+                    autoincrement_tables.append(table.name)
+        rowid_str = "\n".join(rowid_lines)
+
+        blob_lines = []
+        for table in tables:
+            blobs = tuple(col.name for col in table.columns.values()
+                          if SQLiteScriptBuilder.column_type(col) == ColumnType.BLOB)
+            if blobs:
+                blob_lines.append(f'    "{table.name}": {blobs},')
+        blob_str = "\n".join(blob_lines)
+
+        type_lines = []
+        not_null_lines = []
+        for table in tables:
+            columns = [table.columns[k] for k in cls._insert_columns_key(table)]
+            types = tuple(SQLiteScriptBuilder.column_type(col).value for col in columns)
+            type_lines.append(f'    "{table.name}": {types},')
+
+            # a generated primary key is inserted as NULL
+            pk = table.generated_primary_key()
+            not_null = tuple(col.name for col in columns if col.not_null and col is not pk)
+            if not_null:
+                not_null_lines.append(f'    "{table.name}": {not_null},')
+        type_str = "\n".join(type_lines)
+        not_null_str = "\n".join(not_null_lines)
+
+        return f"""
+# columns of each table, in the same order as in rows. Tables are sorted so that a table comes after every table
+# referenced by its foreign keys.
+TABLES_COLUMNS = {{
+{columns_str}
+}}
+
+# foreign keys of each table as (columns, referenced table, referenced columns)
+TABLES_FOREIGN_KEYS = {{
+{fk_str}
+}}
+
+# generated primary key of each table where it is an alias of rowid (INTEGER PRIMARY KEY)
+TABLES_ROWID_ALIAS = {{
+{rowid_str}
+}}
+
+# tables whose generated primary key is AUTOINCREMENT: keys of deleted rows are never reused
+TABLES_AUTOINCREMENT = {tuple(autoincrement_tables)!r}
+
+# BLOB columns of each table
+TABLES_BLOB_COLUMNS = {{
+{blob_str}
+}}
+
+# sqlite type of each column, in the same order as in TABLES_COLUMNS
+TABLES_COLUMNS_TYPE = {{
+{type_str}
+}}
+
+# NOT NULL columns of each table, a generated primary key is not in it
+TABLES_NOT_NULL_COLUMNS = {{
+{not_null_str}
+}}
+"""
+
+    @classmethod
+    def _insert_columns(cls, table: DbTable) -> List[str]:
+        """Columns name used to insert rows in table, primary key columns at start.
+
+        :return: columns name
+        :rtype: List[str]
+        """
+        return [table.columns[k].name for k in cls._insert_columns_key(table)]
+
+    @staticmethod
+    def _insert_columns_key(table: DbTable) -> List[str]:
+        """Columns key used to insert rows in table, primary key columns at start.
+
+        :return: columns key
+        :rtype: List[str]
+        """
+        pks_key = [col.key for col in table.primary_keys()]
+        return pks_key + [col.key for col in table.columns.values() if not col.pk]
 
     @classmethod
     def _dump_table(cls, table: DbTable) -> str:
@@ -102,21 +1888,32 @@ class ArchitectSQliteConnector:
         :rtype: str
         """
         fcn_name = table.name.lower()
-        cols_name_no_pk = tuple(col.name for col in table.columns.values() if not col.pk)
 
         # in cols name, we put primary key at start
-        cols_name = list(cols_name_no_pk)
-        pk = table.primary_key()
+        cols_name = cls._insert_columns(table)
+
+        # a generated primary key is inserted as None, other primary keys are given like other columns
+        pk = table.generated_primary_key()
         if pk is not None:
-            cols_name.insert(0, pk.name)
-            execute_values = f'None, {", ".join(cols_name_no_pk)}'
+            cols_name_no_pk = cols_name[1:]
+            values = ["None", *cols_name_no_pk]
+            rows_doc = ("In this function, you need to insert primary key values as None. "
+                        "and respect the same order as in table")
         else:
-            execute_values = f'{", ".join(cols_name_no_pk)}'
+            cols_name_no_pk = cols_name
+            values = cols_name_no_pk
+            rows_doc = "In this function, you need to respect the same order as in TABLES_COLUMNS"
+        # trailing comma so that a single value is still a tuple
+        execute_values = f'{", ".join(values)},'
 
         fcn = f'''
     @args_logger_decorator
     def _dump_row_{fcn_name}(self, {", ".join(cols_name_no_pk)}):
         """Dump a row in table {table.name}"""
+        if self._bulk_load_tables is not None:
+            self._bulk_load_tables.add("{table.name}")
+        if self._group_writer is not None:
+            return self._group_writer.put("{table.name}", ({execute_values}))
         req = SqLiteRequestBuilder.set_insert_or_x_request("{table.name}", {cols_name}, "FAIL")
         return self.conn.execute(req, ({execute_values})) 
     
@@ -124,7 +1921,7 @@ class ArchitectSQliteConnector:
     def _dump_rows_{fcn_name}(self, rows, or_x="FAIL"):
         """Dump rows in table {table.name}
     
-        In this function, you need to insert primary key values as None. and respect the same order as in table
+        {rows_doc}
 
         :param rows: rows to add to table
         :type rows: Iterable
@@ -133,7 +1930,33 @@ class ArchitectSQliteConnector:
         :return: Cursor
         :rtype: sqlite3.Cursor
         """
+        if self._bulk_load_tables is not None:
+            self._bulk_load_tables.add("{table.name}")
         req = SqLiteRequestBuilder.set_insert_or_x_request("{table.name}", {cols_name}, or_x)
-        return self.conn.executemany(req, rows)'''
+        cursor = self.conn.executemany(req, rows)
+        self._release_write_lock()
+        return cursor
+
+    def _dump_columns_{fcn_name}(self, columns, or_x="FAIL"):
+        """Dump rows in table {table.name} given as one sequence by column, see dump_columns"""
+        return self.dump_columns("{table.name}", columns, or_x)
+
+    def _export_{fcn_name}(self, fp, fmt="csv", batch_size=1000):
+        """Write rows of table {table.name} in a text file, see export_table"""
+        return self.export_table("{table.name}", fp, fmt, batch_size)'''
+
+        for col in table.columns.values():
+            # incremental blob I/O finds rows by rowid
+            if SQLiteScriptBuilder.column_type(col) != ColumnType.BLOB or table.without_rowid:
+                continue
+            fcn += f'''
+
+    def _write_blob_{fcn_name}_{col.name.lower()}(self, rowid, fp, size, chunk_size=BLOB_CHUNK_SIZE):
+        """Copy a binary file in column {col.name} of a row of table {table.name}, see write_blob"""
+        return self.write_blob("{table.name}", "{col.name}", rowid, fp, size, chunk_size)
+
+    def _read_blob_{fcn_name}_{col.name.lower()}(self, rowid, out, chunk_size=BLOB_CHUNK_SIZE):
+        """Copy column {col.name} of a row of table {table.name} in a binary file or buffer, see read_blob"""
+        return self.read_blob("{table.name}", "{col.name}", rowid, out, chunk_size)'''
 
         return fcn
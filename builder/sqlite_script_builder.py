@@ -1,19 +1,7 @@
 # coding: utf-8
-from enum import Enum
-
 from .abstract_builder import AbstractBuilder
 from architect import DB, DbTable, TableColumn
-
-
-class ColumnType(Enum):
-    """
-    Associate a type with it's script name
-    """
-    TEXT = "TEXT"
-    INTEGER = "INTEGER"
-    BLOB = "BLOB"
-    REAL = "REAL"
-    NULL = "NULL"
+from architect.table_column import ColumnType
 
 
 class SQLiteScriptBuilder(AbstractBuilder):
@@ -31,43 +19,8 @@ class SQLiteScriptBuilder(AbstractBuilder):
         :return: sqlite script line
         :rtype: str
         """
-        tables = {k: cls._dump_table(v) for k, v in db.tables.items()}
-
-        tables_to_dump = []
-        table_dumped_key = []
-
         # while inserting table in script, we need to respect relations order.
-        while 1:
-
-            key_to_remove = []
-            for k, v in tables.items():
-
-                # current table can be inserted next only if tables with foreign key in current table are already
-                # inserted
-                to_insert = True
-                for fk_table_key in db.tables[k].foreign_tables_key():
-                    if fk_table_key not in table_dumped_key:
-                        to_insert = not to_insert
-                        break
-
-                if not to_insert:
-                    continue
-
-                # adding table as next table to insert
-                tables_to_dump.append(v)
-
-                # next iterations and loops we will be able to insert table with a relation implying current table
-                # primary key
-                table_dumped_key.append(k)
-
-                key_to_remove.append(k)
-
-            # removing already inserted tables
-            for k in key_to_remove:
-                del tables[k]
-
-            if len(tables) <= 0:
-                break
+        tables_to_dump = [cls._dump_table(table) for table in db.tables_in_relation_order()]
 
         return "\n\n".join(tables_to_dump)
 
@@ -78,31 +31,85 @@ class SQLiteScriptBuilder(AbstractBuilder):
         :return: sqlite script line
         :rtype: str
         """
-        lines_iterator = (cls._dump_column(v) for v in table.columns.values())
-        columns_str = ",\n".join(lines_iterator)
-        return f"CREATE TABLE {table.name} (\n{columns_str}\n);"
+        lines = [cls._dump_column(v, table) for v in table.columns.values()]
+
+        # a composite primary key is a table constraint
+        pks = table.primary_keys()
+        if len(pks) > 1:
+            lines.append(f"{' ' * 16}PRIMARY KEY ({', '.join(col.name for col in pks)})")
+
+        # a multi-column foreign key is a table constraint too
+        for columns, parent, parent_columns in table.foreign_keys():
+            if len(columns) > 1:
+                lines.append(f"{' ' * 16}FOREIGN KEY ({', '.join(col.name for col in columns)}) "
+                             f"REFERENCES {parent.name}({', '.join(col.name for col in parent_columns)})")
+        columns_str = ",\n".join(lines)
+
+        options = []
+        if table.without_rowid:
+            error = cls.without_rowid_error(table)
+            if error is not None:
+                raise ValueError(error)
+            options.append("WITHOUT ROWID")
+        if table.strict:
+            options.append("STRICT")
+        options_str = f" {', '.join(options)}" if options else ""
+
+        return f"CREATE TABLE {table.name} (\n{columns_str}\n){options_str};"
 
     @classmethod
-    def _dump_column(cls, column: TableColumn) -> str:
+    def without_rowid_error(cls, table: DbTable):
+        """Reason why table can not be created WITHOUT ROWID.
+
+        :return: error message, None if table can be created WITHOUT ROWID
+        :rtype: str
+        """
+        if not table.primary_keys():
+            return f"table '{table.name}' needs a primary key to be created WITHOUT ROWID"
+
+        # sqlite only allows AUTOINCREMENT on an INTEGER PRIMARY KEY, alias of rowid
+        pk = table.primary_key()
+        if pk is not None and pk.autoincrement and cls.column_type(pk) == ColumnType.INTEGER:
+            return f"AUTOINCREMENT column '{table.name}.{pk.name}' can not be in a WITHOUT ROWID table"
+        return None
+
+    @classmethod
+    def column_type(cls, column: TableColumn) -> ColumnType:
+        """Sqlite type of a column, from its PowerArchitect type.
+
+        :return: sqlite type
+        :rtype: ColumnType
+        """
+        return column.sqlite_type
+
+    @classmethod
+    def _dump_column(cls, column: TableColumn, table: DbTable) -> str:
         """Create sqlite script lines to create this column.
 
-        managed: primary key, foreign key, not null
+        managed: primary key, autoincrement, one column foreign key, not null
 
+        :param column: column
+        :type column: TableColumn
+        :param table: table containing column
+        :type table: DbTable
         :return: sqlite script line
         :rtype: str
         """
 
-        type_assoc_map = {
-            4: ColumnType.INTEGER,
-            -2: ColumnType.BLOB,
-            12: ColumnType.TEXT,
-            1: ColumnType.TEXT,
-        }
-
-        str_type = type_assoc_map.get(column.type, ColumnType.INTEGER).value
-        not_null_str = " NOT NULL" * column.not_null * (not column.pk)
-        pk_str = " PRIMARY KEY" * column.pk
-        fk_str = f"  REFERENCES {column.fk_table.name}({column.fk_column.name})"*column.fk if column.fk else ''
+        str_type = cls.column_type(column).value
+        # composite primary key is declared after columns
+        inline_pk = column.pk and table.primary_key() is column
+
+        # sqlite only allows AUTOINCREMENT on an INTEGER PRIMARY KEY, alias of rowid
+        autoincrement = inline_pk and column.autoincrement and str_type == ColumnType.INTEGER.value
+
+        # sqlite accepts NULL in a primary key which is not an alias of rowid
+        not_null_str = " NOT NULL" * column.not_null * (column is not table.generated_primary_key())
+        pk_str = " PRIMARY KEY" * inline_pk + " AUTOINCREMENT" * autoincrement
+        # a column of a multi-column foreign key is declared after columns
+        inline_fk = column.fk and not any(col is not column and col.fk and col.fk_key == column.fk_key
+                                          for col in table.columns.values())
+        fk_str = f"  REFERENCES {column.fk_table.name}({column.fk_column.name})" if inline_fk else ''
 
         line = f"{' ' * 16}{column.name} {str_type}{not_null_str}{pk_str}{fk_str}"
         return line
@@ -396,9 +396,10 @@ def create_column(column_node):
     autoincrement = column_node.attrib["autoIncrement"] == "true"
     not_null = column_node.attrib["nullable"] == "0"
     pk = "primaryKeySeq" in column_node.attrib
+    pk_seq = int(column_node.attrib["primaryKeySeq"]) if pk else None
     column_type = int(column_node.attrib["type"])
 
-    return TableColumn(key, name, autoincrement, pk, column_type, not_null)
+    return TableColumn(key, name, autoincrement, pk, column_type, not_null, pk_seq)
 
 
 def add_relation_in_db(db: DB, table_node, column_node):
@@ -411,7 +412,8 @@ def add_relation_in_db(db: DB, table_node, column_node):
     pk_column_key = column_node.attrib["pk-column-ref"]
     fk_column_key = column_node.attrib["fk-column-ref"]
 
-    db.add_relation(pk_table_key, fk_table_key, pk_column_key, fk_column_key)
+    # column mappings of a relationship are one foreign key, each mapping is its own key without relationship id
+    db.add_relation(pk_table_key, fk_table_key, pk_column_key, fk_column_key, table_node.attrib.get("id"))
 
 
 def load_from_architect_file(filepath):
@@ -431,7 +433,7 @@ def load_from_architect_file(filepath):
 
     relations = xml_browser.get_node(("target-database", "relationships", "relationship"))
     for relation in relations:
-        column_mapping = xml_browser.get_node(("column-mapping",), relation)
-        add_relation_in_db(db, relation, column_mapping[0])
+        for column_mapping in xml_browser.get_node(("column-mapping",), relation):
+            add_relation_in_db(db, relation, column_mapping)
 
     return db
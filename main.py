@@ -1,26 +1,101 @@
 # coding: utf-8
+import importlib.util
+import itertools
+import os
+import sys
 from argparse import ArgumentParser
+from types import ModuleType
+from typing import List, Optional
 
 from architect import DB
 from data_io import load_from_architect_file
 from builder import SQLiteScriptBuilder, PythonScriptBuilder
 
+_module_ids = itertools.count()
+
 
 def sqlite_script(db: DB, filepath: str):
     with open(filepath, "w") as fp:
         fp.write(SQLiteScriptBuilder.dump(db))
 
 
-def python_script(db: DB, filepath: str):
+def python_script(db: DB, filepath: str, shard_by: Optional[str] = None):
     with open(filepath, "w") as fp:
-        fp.write(PythonScriptBuilder.dump(db))
+        fp.write(PythonScriptBuilder.dump(db, shard_by))
+
+
+def python_package(db: DB, directory: str, shard_by: Optional[str] = None):
+    os.makedirs(directory, exist_ok=True)
+    for filename, script in PythonScriptBuilder.dump_package(db, shard_by).items():
+        with open(os.path.join(directory, filename), "w") as fp:
+            fp.write(script)
+
+
+def load_connector(db: DB, directory: str, shard_by: Optional[str] = None) -> ModuleType:
+    """Write sqlite script and python module built from db in directory, then import the module.
+
+    Each call imports a new module, registered in sys.modules so that its functions can be pickled.
+
+    :param db: Database object
+    :type db: DB
+    :param directory: output directory, the module reads its sqlite script relatively to it
+    :type directory: str
+    :param shard_by: "table.column" of the sharded connector, none if None
+    :type shard_by: str
+    :return: generated module
+    :rtype: ModuleType
+    """
+    os.makedirs(os.path.join(directory, "ressources", "sqlite"), exist_ok=True)
+    sqlite_script(db, os.path.join(directory, "ressources", "sqlite", "sqlite.sql"))
+    module_path = os.path.join(directory, "architect_connector.py")
+    python_script(db, module_path, shard_by)
+
+    spec = importlib.util.spec_from_file_location(f"architect_connector_{next(_module_ids)}", module_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    cwd = os.getcwd()
+    os.chdir(directory)
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        os.chdir(cwd)
+    return module
+
+
+def set_storage_options(db: DB, without_rowid: Optional[List[str]] = None, strict: Optional[List[str]] = None):
+    """Set tables storage options, an empty list of tables name selects every table.
+
+    Every table selects only tables which can be created WITHOUT ROWID and whose primary key is not generated by
+    sqlite: a single INTEGER primary key is an alias of rowid, it is already the key of the table b-tree. A table
+    named in without_rowid must only be one which can be created WITHOUT ROWID.
+
+    :raise ValueError: unknown table name, or a named table can not be created WITHOUT ROWID
+    """
+    names = {table.name for table in db.tables.values()}
+    for option, tables_name in (("--without-rowid", without_rowid), ("--strict", strict)):
+        unknown_names = set(tables_name or ()).difference(names)
+        if unknown_names:
+            raise ValueError(f"{option}: unknown tables {sorted(unknown_names)}")
 
+    for table in db.tables.values():
+        if without_rowid is not None and (not without_rowid or table.name in without_rowid):
+            error = SQLiteScriptBuilder.without_rowid_error(table)
+            if error is not None and without_rowid:
+                raise ValueError(f"--without-rowid: {error}")
+            table.without_rowid = error is None and (bool(without_rowid) or table.generated_primary_key() is None)
+        if strict is not None and (not strict or table.name in strict):
+            table.strict = True
 
-def launch(script, sqlite, py):
+
+def launch(script, sqlite, py, package=None, shard_by=None, without_rowid=None, strict=None):
 
     db = load_from_architect_file(script)
+    set_storage_options(db, without_rowid, strict)
     sqlite_script(db, sqlite)
-    python_script(db, py)
+    if package is None:
+        python_script(db, py, shard_by)
+    else:
+        python_package(db, package, shard_by)
 
 
 def cmd_line_interface():
@@ -44,9 +119,24 @@ def cmd_line_interface():
     parser.add_argument("-p", "--py", help=f"python file path, default:{py_default}",
                         default=py_default, type=str)
 
+    parser.add_argument("-P", "--package", help="python package directory, one module by table imported on first "
+                                                "access, replaces --py", default=None, type=str)
+
+    parser.add_argument("--shard-by", help="TABLE.COLUMN spreading rows over several files, add a sharded connector",
+                        default=None, type=str)
+
+    parser.add_argument("--without-rowid", help="create tables WITHOUT ROWID, every table allowing it and without "
+                                                 "a rowid alias primary key if no table is given", nargs="*", default=None, metavar="TABLE")
+
+    parser.add_argument("--strict", help="create STRICT tables, every table if no table is given",
+                        nargs="*", default=None, metavar="TABLE")
+
     args = parser.parse_args()
 
-    launch(**args.__dict__)
+    try:
+        launch(**args.__dict__)
+    except ValueError as error:
+        parser.error(str(error))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,43 @@
+# coding: utf-8
+from types import ModuleType
+from typing import Optional
+
+from architect import DB, DbTable, TableColumn
+import main
+
+
+def make_db() -> DB:
+    """Customer <- Orders <- Tag with generated INTEGER keys, and Country with a TEXT primary key."""
+    db = DB()
+    tables = {
+        "T1": ("Customer", [TableColumn("c1", "id", True, True, 4, True),
+                            TableColumn("c2", "name", False, False, 12, True)]),
+        "T2": ("Orders", [TableColumn("o1", "id", False, True, 4, True),
+                          TableColumn("o2", "customer_id", False, False, 4, True),
+                          TableColumn("o3", "label", False, False, 12, False)]),
+        "T3": ("Tag", [TableColumn("g1", "id", False, True, 4, True),
+                       TableColumn("g2", "order_id", False, False, 4, True),
+                       TableColumn("g3", "data", False, False, -2, False)]),
+        "T4": ("Country", [TableColumn("k1", "code", False, True, 12, True),
+                           TableColumn("k2", "label", False, False, 12, True)]),
+    }
+    for key, (name, columns) in tables.items():
+        db.tables[key] = DbTable(key, name, {col.key: col for col in columns})
+    db.add_relation("T1", "T2", "c1", "o2")
+    db.add_relation("T2", "T3", "o1", "g2")
+    return db
+
+
+def load_connector(directory: str, db: Optional[DB] = None, shard_by: Optional[str] = None) -> ModuleType:
+    """Import a connector module built from db, see main.load_connector.
+
+    :param directory: output directory
+    :type directory: str
+    :param db: Database object, default make_db()
+    :type db: DB
+    :param shard_by: "table.column" of the sharded connector, none if None
+    :type shard_by: str
+    :return: generated module
+    :rtype: ModuleType
+    """
+    return main.load_connector(make_db() if db is None else db, directory, shard_by)
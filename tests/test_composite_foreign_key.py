@@ -0,0 +1,78 @@
+# coding: utf-8
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from builder import SQLiteScriptBuilder
+from data_io import load_from_architect_file
+from tests.generated_connector import load_connector
+
+ARCHITECT_SCRIPT = """<?xml version="1.0" encoding="UTF-8"?>
+<architect-project version="1.0" appversion="1.0.8">
+ <target-database id="DB0" name="New Database">
+  <table id="TAB1" name="Pair">
+   <folder id="FOL1" name="Columns" type="1">
+    <column id="COL1" name="a" type="4" autoIncrement="false" nullable="0" primaryKeySeq="0"/>
+    <column id="COL2" name="b" type="12" autoIncrement="false" nullable="0" primaryKeySeq="1"/>
+   </folder>
+  </table>
+  <table id="TAB2" name="Child">
+   <folder id="FOL2" name="Columns" type="1">
+    <column id="COL3" name="id" type="4" autoIncrement="true" nullable="0" primaryKeySeq="0"/>
+    <column id="COL4" name="pa" type="4" autoIncrement="false" nullable="0"/>
+    <column id="COL5" name="pb" type="12" autoIncrement="false" nullable="0"/>
+   </folder>
+  </table>
+  <relationships>
+   <relationship id="REL1" pk-table-ref="TAB1" fk-table-ref="TAB2">
+    <column-mapping pk-column-ref="COL1" fk-column-ref="COL4"/>
+    <column-mapping pk-column-ref="COL2" fk-column-ref="COL5"/>
+   </relationship>
+  </relationships>
+ </target-database>
+</architect-project>
+"""
+
+
+class CompositeForeignKeyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        script_path = os.path.join(self.tmp_dir.name, "script.xml")
+        with open(script_path, "w") as fp:
+            fp.write(ARCHITECT_SCRIPT)
+        self.db = load_from_architect_file(script_path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_relationship_is_one_foreign_key(self):
+        child = self.db.tables["TAB2"]
+        (columns, parent, parent_columns), = child.foreign_keys()
+
+        self.assertEqual([col.name for col in columns], ["pa", "pb"])
+        self.assertIs(parent, self.db.tables["TAB1"])
+        self.assertEqual([col.name for col in parent_columns], ["a", "b"])
+        self.assertIn("FOREIGN KEY (pa, pb) REFERENCES Pair(a, b)", SQLiteScriptBuilder.dump(self.db))
+
+    def test_insert(self):
+        module = load_connector(self.tmp_dir.name, self.db)
+        connector = module.ArchitectSQliteConnector(":memory:", True)
+        self.assertEqual(module.TABLES_FOREIGN_KEYS["Child"], ((("pa", "pb"), "Pair", ("a", "b")),))
+
+        connector._dump_row_pair(1, "x")
+        connector._dump_row_child(1, "x")
+        with self.assertRaises(sqlite3.IntegrityError):
+            connector._dump_row_child(1, "y")
+
+        with connector.bulk_load() as violations:
+            connector._dump_row_child(2, "x")
+        self.assertEqual([(fk["columns"], fk["parent_columns"]) for fk in violations["Child"]],
+                         [(["pa", "pb"], ["a", "b"])])
+        self.assertEqual(connector.conn.execute("SELECT pa, pb FROM Child;").fetchall(), [(1, "x")])
+        connector.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
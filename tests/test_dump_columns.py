@@ -0,0 +1,56 @@
+# coding: utf-8
+import array
+import tempfile
+import unittest
+
+from tests.generated_connector import load_connector
+
+
+class DumpColumnsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.module = load_connector(self.tmp_dir.name)
+        self.connector = self.module.ArchitectSQliteConnector(":memory:", True)
+
+    def tearDown(self):
+        self.connector.close()
+        self.tmp_dir.cleanup()
+
+    def select(self, req):
+        return self.connector.conn.execute(req).fetchall()
+
+    def test_missing_generated_primary_key_is_generated(self):
+        self.connector._dump_columns_customer({"name": ["first", "second", "third"]})
+
+        self.assertEqual(self.select("SELECT id, name FROM Customer ORDER BY id;"),
+                         [(1, "first"), (2, "second"), (3, "third")])
+
+    def test_sequences(self):
+        self.connector._dump_columns_customer({"name": ["first", "second"]})
+        self.connector._dump_columns_orders({"customer_id": array.array("q", [2, 1, 2]), "label": ("a", "b", "c")})
+
+        self.assertEqual(self.select("SELECT id, customer_id, label FROM Orders ORDER BY id;"),
+                         [(1, 2, "a"), (2, 1, "b"), (3, 2, "c")])
+
+    def test_length_mismatch(self):
+        with self.assertRaises(ValueError):
+            self.connector._dump_columns_orders({"customer_id": [1, 1], "label": ["a"]})
+        self.assertEqual(self.select("SELECT * FROM Orders;"), [])
+
+    def test_unknown_column(self):
+        with self.assertRaises(ValueError):
+            self.connector._dump_columns_customer({"name": ["first"], "email": ["first@example.com"]})
+        self.assertEqual(self.select("SELECT * FROM Customer;"), [])
+
+    def test_missing_not_null_column(self):
+        # a TEXT primary key is not generated
+        with self.assertRaises(ValueError):
+            self.connector._dump_columns_country({"label": ["France"]})
+        self.connector._dump_columns_country({"code": ["FR"], "label": ["France"]})
+
+        self.assertEqual(self.select("SELECT code, label FROM Country;"), [("FR", "France")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+# coding: utf-8
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+
+from tests.generated_connector import load_connector
+
+
+class GroupCommitTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.module = load_connector(self.tmp_dir.name)
+        self.connector = self.module.ArchitectSQliteConnector(os.path.join(self.tmp_dir.name, "db.sqlite"), True)
+        # one group for every row of a test
+        self.connector.start_group_commit(max_rows=1000, max_delay=10.)
+
+    def tearDown(self):
+        try:
+            self.connector.close()
+        except (sqlite3.Error, RuntimeError):
+            pass
+        self.tmp_dir.cleanup()
+
+    def count(self, table):
+        return self.connector.conn.execute(f"SELECT COUNT(*) FROM {table};").fetchone()[0]
+
+    def test_rejected_row_does_not_drop_its_group(self):
+        first = self.connector._dump_row_customer("first")
+        second = self.connector._dump_row_customer("second")
+        orphan = self.connector._dump_row_orders(999, "no customer 999")
+
+        with self.assertRaises(self.module.GroupCommitError) as context:
+            self.connector.flush()
+
+        self.assertEqual(context.exception.failures[0][:2], ("Orders", (None, 999, "no customer 999")))
+        self.assertEqual(len(context.exception.failures), 1)
+        self.assertIsInstance(orphan.exception(), sqlite3.IntegrityError)
+        self.assertIsNone(first.result())
+        self.assertIsNone(second.result())
+        self.assertEqual(self.count("Customer"), 2)
+        self.assertEqual(self.count("Orders"), 0)
+
+        # failures are reported once
+        self.connector.flush()
+
+    def test_dump_rows_does_not_lock_writer(self):
+        self.connector._dump_rows_customer([(None, "first"), (None, "second")])
+        queued = self.connector._dump_row_customer("third")
+
+        self.connector.flush()
+
+        self.assertIsNone(queued.result())
+        self.assertEqual(self.count("Customer"), 3)
+
+    def test_writer_error_does_not_block_flush(self):
+        def commit():
+            raise ZeroDivisionError("unexpected")
+        self.connector._group_writer._commit = commit
+        queued = self.connector._dump_row_customer("first")
+
+        with self.assertRaises(self.module.GroupCommitError) as context:
+            self.connector.flush()
+
+        self.assertIsInstance(context.exception.failures[0][2], ZeroDivisionError)
+        self.assertIsInstance(queued.exception(), ZeroDivisionError)
+        with self.assertRaises(RuntimeError):
+            self.connector._dump_row_customer("second")
+        with self.assertRaises(RuntimeError):
+            self.connector.flush()
+
+    def test_locked_database_is_retried(self):
+        self.connector._group_writer.close()
+        self.connector._group_writer = None
+        self.connector.start_group_commit(max_rows=1000, max_delay=0.01, busy_timeout=0.01, busy_retries=20)
+        other = sqlite3.connect(os.path.join(self.tmp_dir.name, "db.sqlite"), isolation_level=None)
+        other.execute("BEGIN EXCLUSIVE;")
+        queued = [self.connector._dump_row_customer(name) for name in ("first", "second")]
+
+        # writer meets the lock before it is released
+        time.sleep(0.2)
+        other.execute("COMMIT;")
+        other.close()
+        self.connector.flush()
+
+        self.assertEqual([future.result() for future in queued], [None, None])
+        self.assertEqual(self.count("Customer"), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
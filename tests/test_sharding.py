@@ -0,0 +1,69 @@
+# coding: utf-8
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from tests.generated_connector import load_connector
+
+
+class ShardingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.module = load_connector(self.tmp_dir.name, shard_by="Customer.id")
+        self.filepaths = [os.path.join(self.tmp_dir.name, f"shard_{i}.sqlite") for i in range(3)]
+        self.connector = self.module.ShardedArchitectSQliteConnector(self.filepaths, True)
+
+    def tearDown(self):
+        self.connector.close()
+        self.tmp_dir.cleanup()
+
+    def rows(self, shard, table):
+        return self.connector.shards[shard].conn.execute(f"SELECT * FROM {table} ORDER BY 1;").fetchall()
+
+    def test_generated_shard_key_is_allocated_round_robin(self):
+        for name in "abcdef":
+            self.connector._dump_row_customer(name)
+        self.connector._dump_row_customer("given", id=10)
+
+        # a key is equal to its shard index modulo 3
+        self.assertEqual(self.rows(0, "Customer"), [(3, "a"), (6, "d")])
+        self.assertEqual(self.rows(1, "Customer"), [(1, "b"), (4, "e"), (10, "given")])
+        self.assertEqual(self.rows(2, "Customer"), [(2, "c"), (5, "f")])
+        # next key of shard 1 follows the given one
+        self.connector._dump_row_customer("g")
+        self.connector._dump_row_customer("h")
+        self.assertEqual(self.rows(1, "Customer")[-1], (13, "h"))
+
+    def test_children_follow_their_parent(self):
+        customers = [self.connector._dump_row_customer(name).lastrowid for name in "abc"]
+        self.connector._dump_rows_orders([(None, customer, f"order of {customer}") for customer in customers])
+        for shard in range(3):
+            for order_id, customer_id, _ in self.rows(shard, "Orders"):
+                self.assertEqual(self.connector.shard_of_key(order_id), shard)
+                self.assertEqual(self.connector.shard_of_key(customer_id), shard)
+                self.connector._dump_row_tag(order_id, b"data")
+
+        tags = self.connector.select("SELECT id, order_id FROM Tag ORDER BY id;", key=lambda row: row[0])
+        self.assertEqual(len(tags), 3)
+        self.assertEqual(len({tag_id for tag_id, _ in tags}), 3)
+        for tag_id, order_id in tags:
+            self.assertEqual(self.connector.shard_of_key(tag_id), self.connector.shard_of_key(order_id))
+
+    def test_replicated_rows_are_undone_on_every_shard(self):
+        self.connector._dump_row_country("fr", "France")
+        self.connector.shards[2].conn.execute("INSERT INTO Country VALUES ('de', 'Allemagne');")
+
+        with self.assertRaises(sqlite3.IntegrityError):
+            self.connector._dump_rows_country([("it", "Italie"), ("de", "Allemagne")])
+        with self.assertRaises(sqlite3.IntegrityError):
+            self.connector._dump_row_country("de", "Allemagne")
+
+        self.connector.commit()
+        self.assertEqual([self.rows(shard, "Country") for shard in range(3)],
+                         [[("fr", "France")], [("fr", "France")], [("de", "Allemagne"), ("fr", "France")]])
+
+
+if __name__ == "__main__":
+    unittest.main()
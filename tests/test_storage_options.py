@@ -0,0 +1,32 @@
+# coding: utf-8
+import unittest
+
+from main import set_storage_options
+from tests.generated_connector import make_db
+
+
+class StorageOptionsTest(unittest.TestCase):
+
+    def without_rowid_tables(self, db):
+        return sorted(table.name for table in db.tables.values() if table.without_rowid)
+
+    def test_every_table_skips_rowid_alias_primary_keys(self):
+        db = make_db()
+        set_storage_options(db, [])
+
+        # Customer is AUTOINCREMENT, Orders and Tag have an INTEGER primary key aliasing rowid
+        self.assertEqual(self.without_rowid_tables(db), ["Country"])
+
+    def test_named_table(self):
+        db = make_db()
+        set_storage_options(db, ["Orders"])
+
+        self.assertEqual(self.without_rowid_tables(db), ["Orders"])
+        with self.assertRaises(ValueError):
+            set_storage_options(make_db(), ["Customer"])
+        with self.assertRaises(ValueError):
+            set_storage_options(make_db(), ["Unknown"])
+
+
+if __name__ == "__main__":
+    unittest.main()